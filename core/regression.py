@@ -172,6 +172,13 @@ def calculate_rolling_statistics(
     """
     Calculate rolling mean and standard deviation for z-score calculation.
     
+    Closed form via cumulative sums (no per-window loop):
+    1. Centre residuals on their overall mean (limits cancellation)
+    2. Window sums S1, S2 = differences of cumsum(x), cumsum(x²)
+    3. mean = S1/k, std = sqrt(S2/k - mean²) with k = window length
+    
+    The first lookback-1 entries use the expanding window, as before.
+    
     Args:
         residuals: Array of residual values
         lookback: Rolling window size (default 20)
@@ -188,13 +195,21 @@ def calculate_rolling_statistics(
         return np.full(n, mean), np.full(n, std)
     
     # Calculate rolling statistics
-    rolling_mean = np.zeros(n)
-    rolling_std = np.zeros(n)
-    
-    for i in range(n):
-        start = max(0, i - lookback + 1)
-        window = residuals[start:i + 1]
-        rolling_mean[i] = np.mean(window)
-        rolling_std[i] = np.std(window) if len(window) > 1 else 0.0
+    residuals = np.asarray(residuals, dtype=np.float64)
+    shift = residuals.mean()
+    centred = residuals - shift
+    
+    csum = np.concatenate(([0.0], np.cumsum(centred)))
+    csum_sq = np.concatenate(([0.0], np.cumsum(centred * centred)))
+    
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - lookback, 0)
+    count = end - start
+    
+    window_mean = (csum[end] - csum[start]) / count
+    window_var = (csum_sq[end] - csum_sq[start]) / count - window_mean ** 2
+    
+    rolling_mean = window_mean + shift
+    rolling_std = np.sqrt(np.maximum(window_var, 0.0))
     
     return rolling_mean, rolling_std
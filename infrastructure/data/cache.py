@@ -336,15 +336,15 @@ class DataCache:
             if sym in ltp_dict and not series.empty:
                 current_ltp = ltp_dict[sym]
                 
-                # Make a copy of the series
-                live_series = series.copy()
-                
-                # Update or append today's price with live LTP
-                if today_key in live_series.index:
+                # Update or append today's price with live LTP.
+                # Only the in-place update needs a copy - concat already
+                # returns a new series.
+                if today_key in series.index:
+                    live_series = series.copy()
                     live_series.loc[today_key] = current_ltp
                 else:
                     new_row = pd.Series([current_ltp], index=[today_key])
-                    live_series = pd.concat([live_series, new_row])
+                    live_series = pd.concat([series, new_row])
                 
                 live_results[sym] = live_series
             else:
@@ -1,6 +1,8 @@
 import os
 import time
+import threading
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # NEW IMPORTS
@@ -20,6 +22,10 @@ CHUNK_LIMITS = {
     "60minute": 360, "day": 2000
 }
 
+# Kite historical API: 3 requests/sec per user
+HISTORICAL_REQ_PER_SEC = 3
+MAX_DOWNLOAD_WORKERS = 8
+
 class DataManager:
     @staticmethod
     def get_csv_path(symbol, timeframe="5m"):
@@ -42,10 +48,78 @@ class DataManager:
             print(f"Error loading {symbol}: {e}")
             return None
 
+class RateLimiter:
+    """Spaces calls at least 1/per_second apart, across all threads sharing it."""
+    
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second
+        self._lock = threading.Lock()
+        self._next = 0.0
+    
+    def wait(self):
+        """Block until this caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _download_symbol(kite, symbol, token, start_dt, end_dt, api_interval, interval, save_dir, limiter):
+    """Fetch one symbol chunk by chunk and save it; returns a status line."""
+    # Determine safe chunk size (in days)
+    chunk_days = CHUNK_LIMITS.get(api_interval, 60)
+    
+    all_records = []
+    errors = []
+    current_start = start_dt
+
+    # --- CHUNKING LOOP ---
+    while current_start < end_dt:
+        current_end = current_start + timedelta(days=chunk_days)
+        if current_end > end_dt:
+            current_end = end_dt
+        
+        try:
+            # Rate limit protection (3 req/sec rule, shared by all workers)
+            limiter.wait()
+            batch = kite.historical_data(
+                instrument_token=token,
+                from_date=current_start,
+                to_date=current_end,
+                interval=api_interval
+            )
+            if batch:
+                all_records.extend(batch)
+            
+        except Exception as e:
+            errors.append(f"❌ Error fetching chunk {current_start.date()}: {e}")
+            # Don't break, try next chunk or save partial
+        
+        # Move to next chunk
+        current_start = current_end + timedelta(minutes=1)
+
+    status = f"🔄 Processing {symbol}... "
+    if errors:
+        status += " ".join(errors) + " "
+    if not all_records:
+        return status + "⚠️ No data fetched"
+
+    # Save to specified directory
+    df = pd.DataFrame(all_records)
+    path = os.path.join(save_dir, f"{symbol}_{interval}.csv")
+    df.to_csv(path, index=False)
+    return status + f"✅ Saved {len(df)} rows"
+
+
 def download_historical_data(symbols, from_date, to_date, interval="5m", output_dir=None):
     """
     Downloads historical data for a list of symbols.
     
+    Symbols are fetched in parallel (MAX_DOWNLOAD_WORKERS); a shared rate
+    limiter keeps the combined request rate within Kite's historical limit.
+    
     Args:
         symbols: List of stock symbols
         from_date: Start date (YYYY-MM-DD)
@@ -66,53 +140,26 @@ def download_historical_data(symbols, from_date, to_date, interval="5m", output_
     print(f"--- 📥 Downloading {interval} data ({from_date} to {to_date}) ---")
     print(f"    📂 Output: {save_dir}")
 
-    for symbol in symbols:
-        print(f"🔄 Processing {symbol}...", end=" ")
-        
+    # Resolve tokens up front (may refresh the instrument cache once);
+    # each symbol is downloaded once even if listed twice
+    jobs = []
+    for symbol in dict.fromkeys(symbols):
         token = get_instrument_token(symbol)
         if not token:
-            print(f"❌ Token not found for {symbol}")
-            continue
-
-        # Determine safe chunk size (in days)
-        chunk_days = CHUNK_LIMITS.get(api_interval, 60)
-        
-        all_records = []
-        current_start = start_dt
-
-        # --- CHUNKING LOOP ---
-        while current_start < end_dt:
-            current_end = current_start + timedelta(days=chunk_days)
-            if current_end > end_dt:
-                current_end = end_dt
-            
-            try:
-                # Fetch Batch
-                batch = kite.historical_data(
-                    instrument_token=token,
-                    from_date=current_start,
-                    to_date=current_end,
-                    interval=api_interval
-                )
-                if batch:
-                    all_records.extend(batch)
-                    
-                # Rate limit protection (3 req/sec rule)
-                time.sleep(0.4) 
-                
-            except Exception as e:
-                print(f"❌ Error fetching chunk {current_start.date()}: {e}")
-                # Don't break, try next chunk or save partial
-            
-            # Move to next chunk
-            current_start = current_end + timedelta(minutes=1)
-
-        if not all_records:
-            print(f"⚠️ No data fetched")
+            print(f"🔄 Processing {symbol}... ❌ Token not found for {symbol}")
             continue
-
-        # Save to specified directory
-        df = pd.DataFrame(all_records)
-        path = os.path.join(save_dir, f"{symbol}_{interval}.csv")
-        df.to_csv(path, index=False)
-        print(f"✅ Saved {len(df)} rows")
+        jobs.append((symbol, token))
+    
+    if not jobs:
+        return
+    
+    limiter = RateLimiter(HISTORICAL_REQ_PER_SEC)
+    with ThreadPoolExecutor(max_workers=min(MAX_DOWNLOAD_WORKERS, len(jobs))) as executor:
+        futures = [
+            executor.submit(_download_symbol, kite, symbol, token, start_dt, end_dt,
+                            api_interval, interval, save_dir, limiter)
+            for symbol, token in jobs
+        ]
+        # Report in input order
+        for future in futures:
+            print(future.result())
@@ -13,6 +13,7 @@ import json
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import calendar
+import functools
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -142,6 +143,55 @@ class InstrumentCache:
 _instrument_cache = InstrumentCache()
 
 
+# ============================================================
+# NSE TOKEN CACHE
+# ============================================================
+
+NSE_TOKENS_FILE = os.path.join(config.CACHE_DIR, "nse_tokens.json")
+
+
+def get_nse_tokens(kite, symbols, cache_file: Optional[str] = None) -> Dict[str, int]:
+    """
+    Instrument tokens for NSE symbols, via a daily disk cache.
+    
+    The NSE instrument master is downloaded at most once per day and only
+    the symbol -> token map is kept on disk.
+    
+    Args:
+        kite: Authenticated KiteConnect instance (used on cache miss)
+        symbols: Trading symbols to resolve
+        cache_file: Optional override for the cache path
+    
+    Returns:
+        Dict of symbol -> instrument_token (unknown symbols omitted)
+    
+    Raises:
+        Whatever kite.instruments() raises when the cache is stale
+    """
+    cache_file = cache_file or NSE_TOKENS_FILE
+    token_map = None
+    
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get('_cache_date') == date.today().isoformat():
+                token_map = data.get('tokens', {})
+        except (json.JSONDecodeError, ValueError, OSError):
+            token_map = None
+    
+    if token_map is None:
+        instruments = kite.instruments("NSE")
+        token_map = {i['tradingsymbol']: i['instrument_token'] for i in instruments}
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump({'tokens': token_map, '_cache_date': date.today().isoformat()}, f)
+        except Exception as e:
+            print(f"   ⚠️ Failed to cache NSE tokens: {e}")
+    
+    return {s: token_map[s] for s in symbols if s in token_map}
+
+
 # ============================================================
 # FUTURES LOOKUP (From Kite Instruments)
 # ============================================================
@@ -200,28 +250,43 @@ def get_futures_details(symbol_root: str, kite=None) -> Optional[Dict]:
     }
 
 
+# Fallback lot sizes when Kite data is unavailable (Updated Jan 2025)
+DEFAULT_LOT_SIZES = {
+    "SBIN": 1500, "HDFCBANK": 550, "ICICIBANK": 1400, "KOTAKBANK": 400,
+    "AXISBANK": 1200, "RELIANCE": 250, "TCS": 150, "INFY": 400,
+    "MARUTI": 100, "TATAMOTORS": 1400, "M&M": 350, "BAJAJ-AUTO": 125,
+    "EICHERMOT": 150, "TATASTEEL": 5500, "JSWSTEEL": 1000,
+    "SUNPHARMA": 350, "HINDUNILVR": 300, "ITC": 1600,
+    "BHARTIARTL": 950, "LT": 150, "TITAN": 175,
+    "BAJFINANCE": 125, "NIFTY": 50, "BANKNIFTY": 15,
+}
+
+
 def get_lot_size(symbol: str, kite=None) -> int:
     """
     Get lot size for a symbol from Kite instruments.
     
     Falls back to hardcoded defaults if Kite data unavailable.
+    Lookups without a live kite are memoized per symbol for the day.
     """
+    if kite is None:
+        return _cached_lot_size(symbol, date.today().toordinal())
+    return _lot_size(symbol, kite)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_lot_size(symbol: str, today_ordinal: int) -> int:
+    """Memoized get_lot_size; the day ordinal key expires entries daily."""
+    return _lot_size(symbol, None)
+
+
+def _lot_size(symbol: str, kite) -> int:
+    """Lot size from the instrument master, else DEFAULT_LOT_SIZES."""
     # Try to get from Kite instruments first
     details = get_futures_details(symbol, kite)
     if details:
         return details['lot_size']
     
-    # Fallback: hardcoded defaults (Updated Jan 2025)
-    DEFAULT_LOT_SIZES = {
-        "SBIN": 1500, "HDFCBANK": 550, "ICICIBANK": 1400, "KOTAKBANK": 400,
-        "AXISBANK": 1200, "RELIANCE": 250, "TCS": 150, "INFY": 400,
-        "MARUTI": 100, "TATAMOTORS": 1400, "M&M": 350, "BAJAJ-AUTO": 125,
-        "EICHERMOT": 150, "TATASTEEL": 5500, "JSWSTEEL": 1000,
-        "SUNPHARMA": 350, "HINDUNILVR": 300, "ITC": 1600,
-        "BHARTIARTL": 950, "LT": 150, "TITAN": 175,
-        "BAJFINANCE": 125, "NIFTY": 50, "BANKNIFTY": 15,
-    }
-    
     base_symbol = symbol.upper()
     # Remove futures suffix if present
     for suffix in ["FUT", "25", "24"]:
@@ -407,10 +472,12 @@ def download_futures_historical(symbol_root: str, from_date: str, to_date: str,
 # SYMBOL MAPPING (Fallback for offline use)
 # ============================================================
 
+@functools.lru_cache(maxsize=256)
 def get_expiry_date(year: int, month: int) -> date:
     """
     Get last Thursday of the month (F&O expiry).
     Used as fallback when Kite data unavailable.
+    Pure function of (year, month), so results are memoized.
     """
     last_day = calendar.monthrange(year, month)[1]
     
@@ -527,6 +594,9 @@ def days_to_expiry(symbol: str, kite=None) -> int:
         
     Returns:
         Number of calendar days to expiry (0 if expired, -1 if error)
+    
+    Without a kite instance the result is memoized per (symbol, day),
+    avoiding a scan of the full instrument list on every call.
     """
     # Extract base symbol if futures symbol provided
     base_symbol = symbol.upper()
@@ -536,11 +606,24 @@ def days_to_expiry(symbol: str, kite=None) -> int:
                   "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]:
         base_symbol = base_symbol.replace(month, "")
     
+    today = date.today()
+    if kite is None:
+        return _cached_days_to_expiry(base_symbol, today.toordinal())
+    return _days_to_expiry(base_symbol, kite, today)
+
+
+@functools.lru_cache(maxsize=512)
+def _cached_days_to_expiry(base_symbol: str, today_ordinal: int) -> int:
+    """Memoized days_to_expiry; the day ordinal key expires entries daily."""
+    return _days_to_expiry(base_symbol, None, date.fromordinal(today_ordinal))
+
+
+def _days_to_expiry(base_symbol: str, kite, today: date) -> int:
+    """Days from `today` to the current contract's expiry."""
     details = get_futures_details(base_symbol, kite)
     
     if not details or not details.get('expiry'):
         # Fallback: calculate from current month
-        today = date.today()
         expiry = get_expiry_date(today.year, today.month)
         if today > expiry:
             # Use next month
@@ -557,7 +640,7 @@ def days_to_expiry(symbol: str, kite=None) -> int:
         else:
             expiry = expiry_str
     
-    days = (expiry - date.today()).days
+    days = (expiry - today).days
     return max(0, days)
 
 
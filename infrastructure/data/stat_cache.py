@@ -0,0 +1,84 @@
+"""
+Stationarity Test Cache - memoized ADF
+
+StatArbBot.calibrate() frequently re-tests the exact same residual series
+(e.g. when LEADER/CHALLENGER roles swap, or on repeated calibration over an
+unchanged price window). The ADF test is the most expensive step per pair,
+so results are memoized by a content hash of the residual array.
+
+Returned tuples are shared between callers - treat them as read-only.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable
+
+import numpy as np
+from statsmodels.tsa.stattools import adfuller
+
+
+MAX_ENTRIES = 4096
+
+
+class _StatMemo:
+    """Thread-safe LRU keyed by (array digest, test parameters)."""
+
+    def __init__(self, func, maxsize: int = MAX_ENTRIES):
+        self._func = func
+        self._maxsize = maxsize
+        self._cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, arr, **kwargs) -> tuple:
+        data = np.ascontiguousarray(arr, dtype=np.float64)
+        key = (_digest(data), tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Run the test outside the lock - a concurrent duplicate is harmless
+        result = self._func(data, **kwargs)
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return result
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache)}
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _digest(data: np.ndarray) -> bytes:
+    """128-bit content hash of a contiguous float64 array."""
+    h = hashlib.blake2b(data.tobytes(), digest_size=16)
+    h.update(len(data).to_bytes(8, 'little'))
+    return h.digest()
+
+
+adf_memo = _StatMemo(adfuller)
+
+
+def cache_info() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters per memo."""
+    return {'adf': adf_memo.cache_info()}
+
+
+def cache_clear():
+    """Drop all memoized results and reset counters."""
+    adf_memo.cache_clear()
@@ -291,23 +291,27 @@ class HybridBacktest:
         basis_risk_total = 0.0
         skipped_days = 0  # Track skipped days due to missing futures
         
-        # History buffers (SPOT only - for signals)
-        hist_y = []
-        hist_x = []
+        # Column arrays extracted once - per-bar .iloc lookups dominate the loop
+        dates = df_spot.index
+        spot_y_arr = df_spot['Y'].to_numpy(dtype=np.float64)
+        spot_x_arr = df_spot['X'].to_numpy(dtype=np.float64)
+        if df_futures is not None:
+            fut_y_arr = df_futures['Y'].to_numpy(dtype=np.float64)  # Safe because of inner-join above
+            fut_x_arr = df_futures['X'].to_numpy(dtype=np.float64)
         
         # Main backtest loop
-        for i in range(len(df_spot)):
-            dt = df_spot.index[i]
+        for i in range(len(spot_y_arr)):
+            dt = dates[i]
             
             # SPOT prices (for signals)
-            spot_y = df_spot['Y'].iloc[i]
-            spot_x = df_spot['X'].iloc[i]
+            spot_y = spot_y_arr[i]
+            spot_x = spot_x_arr[i]
             
             # FUTURES prices (for P&L)
             # FIX: NO FALLBACK - if futures missing, skip trade entry (but still update history)
             if df_futures is not None:
-                fut_y = df_futures['Y'].iloc[i]  # Safe because of inner-join above
-                fut_x = df_futures['X'].iloc[i]
+                fut_y = fut_y_arr[i]
+                fut_x = fut_x_arr[i]
                 has_futures = True
             else:
                 # Spot-only mode (no futures data available at all)
@@ -315,9 +319,6 @@ class HybridBacktest:
                 fut_x = spot_x
                 has_futures = False
             
-            hist_y.append(spot_y)
-            hist_x.append(spot_x)
-            
             # Guardian health check (uses SPOT data)
             # Bypass if disabled for testing
             if ENABLE_GUARDIAN:
@@ -364,8 +365,8 @@ class HybridBacktest:
                     margin_used = 0
                 continue
             
-            # Need enough data for rolling Z-score
-            if len(hist_y) < LOOKBACK_WINDOW:
+            # Need enough data for rolling Z-score (bars seen so far = i + 1)
+            if i + 1 < LOOKBACK_WINDOW:
                 continue
             
             # FIX #1: Use FIXED sigma from regression (per Zerodha Varsity)
@@ -378,8 +379,8 @@ class HybridBacktest:
                 z = curr_residual / fixed_sigma
             else:
                 # Fallback: Calculate sigma from initial LOOKBACK_WINDOW only
-                window_y = np.array(hist_y[:LOOKBACK_WINDOW])
-                window_x = np.array(hist_x[:LOOKBACK_WINDOW])
+                window_y = spot_y_arr[:LOOKBACK_WINDOW]
+                window_x = spot_x_arr[:LOOKBACK_WINDOW]
                 initial_spread = window_y - (bot.beta * window_x + bot.intercept)
                 fixed_sigma = np.std(initial_spread) if np.std(initial_spread) > 0 else 1.0
                 z = curr_residual / fixed_sigma
@@ -9,6 +9,7 @@ Strategy: Method 2 (Cointegration) with:
 Uses new core/ module for consistent pair analysis.
 """
 
+import numpy as np
 import pandas as pd
 import os
 import sys
@@ -26,7 +27,6 @@ from infrastructure.data.data_manager import download_historical_data
 # Import new core module
 from core import (
     analyze_pair_from_prices,
-    calculate_optimal_direction_from_prices,
     assess_intercept_risk,
     LOOKBACK_PERIOD,
     ADF_THRESHOLD,
@@ -207,6 +207,46 @@ class PairsProgressManager:
             os.remove(self.progress_file)
 
 
+# ============================================================
+# BATCH PAIR STATISTICS
+# ============================================================
+
+def batch_r_squared(symbols: List[str], price_cache: Dict[str, pd.Series]) -> Dict[Tuple[str, str], float]:
+    """
+    R² for every pair in a sector from one correlation-matrix product.
+    
+    Symbols are grouped by series length; each group is stacked into an
+    (N, T) matrix of standardized rows so Z @ Z.T / T yields all pairwise
+    Pearson correlations at once (R² of a simple regression = r², symmetric
+    in X/Y). Pairs of unequal length are left out and fall back to the
+    per-pair regression in the scanner.
+    
+    Returns:
+        Dict mapping (s1, s2) and (s2, s1) to R²
+    """
+    by_length: Dict[int, List[str]] = {}
+    for sym in symbols:
+        by_length.setdefault(len(price_cache[sym]), []).append(sym)
+    
+    r2: Dict[Tuple[str, str], float] = {}
+    for length, group in by_length.items():
+        if len(group) < 2 or length < 2:
+            continue
+        
+        Y = np.stack([price_cache[s].to_numpy(dtype=np.float64) for s in group])
+        Y = Y - Y.mean(axis=1, keepdims=True)
+        std = np.sqrt((Y * Y).mean(axis=1, keepdims=True))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            Z = Y / std
+        corr = (Z @ Z.T) / length
+        
+        for i, j in itertools.combinations(range(len(group)), 2):
+            value = corr[i, j]
+            if np.isfinite(value):
+                r2[(group[i], group[j])] = r2[(group[j], group[i])] = float(value * value)
+    return r2
+
+
 # ============================================================
 # MAIN SCANNER (v3.0 with Core Module)
 # ============================================================
@@ -278,16 +318,20 @@ def scan_pairs(use_cache: bool = True, resume: bool = True):
     
     # 5. Generate all pair combinations
     all_pairs: List[Tuple[str, str, str]] = []  # (s1, s2, sector)
+    r2_lookup: Dict[Tuple[str, str], float] = {}
     
     for sector, symbols in sector_groups.items():
         if len(symbols) < 2:
             continue
         
         valid_symbols = [s for s in symbols if s in price_cache]
+        sector_pairs = [(s1, s2) for s1, s2 in itertools.combinations(valid_symbols, 2)
+                        if not progress.is_tested(s1, s2)]
         
-        for s1, s2 in itertools.combinations(valid_symbols, 2):
-            if not progress.is_tested(s1, s2):
-                all_pairs.append((s1, s2, sector))
+        if sector_pairs:
+            r2_lookup.update(batch_r_squared(valid_symbols, price_cache))
+        for s1, s2 in sector_pairs:
+            all_pairs.append((s1, s2, sector))
     
     total_pairs = len(all_pairs)
     print(f"\n⚙️ Testing {total_pairs} pairs for cointegration...")
@@ -333,26 +377,21 @@ def scan_pairs(use_cache: bool = True, resume: bool = True):
                 prices_1 = price_cache[s1].values
                 prices_2 = price_cache[s2].values
                 
-                # Step 1: Determine optimal X/Y using error ratio
-                optimal = calculate_optimal_direction_from_prices(prices_1, prices_2, s1, s2)
-                
-                # Get optimal X and Y (returns 'X' and 'Y' keys)
-                sym_y = optimal['Y']
-                sym_x = optimal['X']
-                prices_y = optimal['Y_prices']
-                prices_x = optimal['X_prices']
-                
-                # Step 2: Full pair analysis with core module
-                # Note: analyze_pair_from_prices determines optimal X/Y internally
-                # We pass prices in order and let it optimize
+                # Steps 1-2: Optimal X/Y (error ratio) + full pair analysis
+                # analyze_pair_from_prices picks X/Y internally - no separate
+                # direction pass needed
                 pair = analyze_pair_from_prices(
-                    prices_a=prices_x,
-                    prices_b=prices_y,
-                    symbol_a=sym_x,
-                    symbol_b=sym_y,
+                    prices_a=prices_1,
+                    prices_b=prices_2,
+                    symbol_a=s1,
+                    symbol_b=s2,
                     sector=sector
                 )
                 
+                sym_y = pair.y_stock
+                sym_x = pair.x_stock
+                prices_y, prices_x = (prices_1, prices_2) if sym_y == s1 else (prices_2, prices_1)
+                
                 # Step 3: Check ADF (stationarity)
                 if not pair.is_stationary:
                     cache_entry = {
@@ -385,9 +424,11 @@ def scan_pairs(use_cache: bool = True, resume: bool = True):
                 
                 # Step 5: NEW - Check R² (critical per AI analysis)
                 # Pairs with R² < 0.40 are NOT truly cointegrated and will blow up
-                from scipy import stats
-                _, _, r_value, _, _ = stats.linregress(prices_x, prices_y)
-                r_squared = r_value ** 2
+                r_squared = r2_lookup.get((s1, s2))
+                if r_squared is None:
+                    from scipy import stats
+                    _, _, r_value, _, _ = stats.linregress(prices_x, prices_y)
+                    r_squared = r_value ** 2
                 
                 if r_squared < MIN_R_SQUARED:
                     print(f"\n      🚫 REJECTED: {sym_y}/{sym_x} | R²={r_squared:.3f} < {MIN_R_SQUARED}")
@@ -404,7 +445,6 @@ def scan_pairs(use_cache: bool = True, resume: bool = True):
                 # Step 6: NEW - Calculate Half-Life of Mean Reversion
                 # Half-Life = -log(2) / log(1 + theta) where theta is from AR(1) regression
                 # If spread takes too long to revert, it's not a good pair
-                import numpy as np
                 residuals = pair.residuals
                 if len(residuals) > 10:
                     # AR(1) regression: residual_t = theta * residual_{t-1} + epsilon
@@ -6,12 +6,13 @@ expensive OLS/ADF computations. Runs full math every N ticks instead
 of every tick.
 """
 
-import pandas as pd
+import math
 import numpy as np
-import statsmodels.api as sm
-from statsmodels.tsa.stattools import adfuller
+from statsmodels.tsa.adfvalues import mackinnonp
 from typing import Tuple, Optional
 
+from strategies.guardian_kernels import ols_from_sums, adf_tstat
+
 
 class AssumptionGuardian:
     """
@@ -21,13 +22,28 @@ class AssumptionGuardian:
     Cached result returned on intermediate ticks.
     """
     
-    # Run expensive math every N diagnose() calls
-    CACHE_INTERVAL = 5
+    # Run expensive math every N diagnose() calls.
+    # Must be a power of two: the cache check is a bitmask, not a modulo.
+    CACHE_INTERVAL = 4
+    _CACHE_MASK = CACHE_INTERVAL - 1
+    
+    # ADF t-stat equivalents of the p-value thresholds below. MacKinnon's
+    # approximate p-value (constant, one series) is monotonic in the
+    # statistic and independent of sample size, so p > 0.30 <=> t > T_30.
+    ADF_T_P30 = -1.9697323953333294
+    ADF_T_P15 = -2.3713038531602795
     
     def __init__(self, lookback_window: int = 60):
         self.lookback = lookback_window
-        self.history_y = []
-        self.history_x = []
+        
+        # Price history as preallocated ring buffers (O(1) per tick)
+        self._buf_y = np.empty(lookback_window, dtype=np.float64)
+        self._buf_x = np.empty(lookback_window, dtype=np.float64)
+        self._widx = 0   # Next slot to write
+        self._count = 0  # Number of valid samples (<= lookback)
+        
+        # Running window sums for O(1) hedge ratio
+        self._sx = self._sy = self._sxx = self._sxy = 0.0
         
         # Baselines
         self.initial_beta: Optional[float] = None
@@ -37,7 +53,7 @@ class AssumptionGuardian:
         self._diagnosis_count = 0
         self._cached_result: Optional[Tuple[str, str]] = None
         self._last_beta: Optional[float] = None
-        self._last_pvalue: Optional[float] = None
+        self._last_adf_stat: Optional[float] = None
 
     def calibrate(self, beta: float):
         """Set initial hedge ratio baseline."""
@@ -46,19 +62,64 @@ class AssumptionGuardian:
         self._cached_result = None
         self._diagnosis_count = 0
 
+    @property
+    def history_y(self) -> np.ndarray:
+        """Y price history, oldest first."""
+        return self._get_arrays()[0]
+
+    @property
+    def history_x(self) -> np.ndarray:
+        """X price history, oldest first."""
+        return self._get_arrays()[1]
+
+    def _get_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Unwrap ring buffers into ordered (oldest first) arrays."""
+        return self._unwrap(self._buf_y), self._unwrap(self._buf_x)
+
+    def _unwrap(self, ring: np.ndarray) -> np.ndarray:
+        """Copy ring contents into a new array, oldest first."""
+        if self._count < self.lookback:
+            return ring[:self._count].copy()
+        idx = self._widx
+        return np.concatenate((ring[idx:], ring[:idx]))
+
     def update_data(self, price_y: float, price_x: float):
         """Add new price data point (filters bad data)."""
-        # Filter Bad Data (NaN, Inf, Zero)
-        if not np.isfinite(price_y) or not np.isfinite(price_x) or price_y == 0 or price_x == 0:
+        # Filter Bad Data (NaN, Inf, Zero) - all propagate through the product
+        prod = price_y * price_x
+        if not math.isfinite(prod) or prod == 0.0:
             return  # Ignore bad tick
-            
-        self.history_y.append(price_y)
-        self.history_x.append(price_x)
         
-        # Maintain window size
-        if len(self.history_y) > self.lookback:
-            self.history_y.pop(0)
-            self.history_x.pop(0)
+        # Overwrite oldest slot once the window is full
+        if self._count == self.lookback:
+            old_y = self._buf_y[self._widx]
+            old_x = self._buf_x[self._widx]
+            self._sx -= old_x
+            self._sy -= old_y
+            self._sxx -= old_x * old_x
+            self._sxy -= old_x * old_y
+        else:
+            self._count += 1
+        
+        self._buf_y[self._widx] = price_y
+        self._buf_x[self._widx] = price_x
+        self._sx += price_x
+        self._sy += price_y
+        self._sxx += price_x * price_x
+        self._sxy += price_x * price_y
+        
+        self._widx = (self._widx + 1) % self.lookback
+        if self._widx == 0:
+            self._resync_sums()  # Drop accumulated rounding once per lap
+
+    def _resync_sums(self):
+        """Recompute running sums exactly from the buffer contents."""
+        y = self._buf_y[:self._count]
+        x = self._buf_x[:self._count]
+        self._sx = float(x.sum())
+        self._sy = float(y.sum())
+        self._sxx = float(np.dot(x, x))
+        self._sxy = float(np.dot(x, y))
 
     def diagnose(self) -> Tuple[str, str]:
         """
@@ -72,11 +133,11 @@ class AssumptionGuardian:
         self._diagnosis_count += 1
         
         # Not enough data
-        if len(self.history_y) < 20:
+        if self._count < 20:
             return "YELLOW", "Initializing"
         
         # OPTIMIZATION #5: Return cached result on intermediate ticks
-        if (self._diagnosis_count % self.CACHE_INTERVAL != 0 
+        if (self._diagnosis_count & self._CACHE_MASK
             and self._cached_result is not None):
             return self._cached_result
         
@@ -87,19 +148,17 @@ class AssumptionGuardian:
     
     def _run_full_diagnosis(self) -> Tuple[str, str]:
         """Run complete OLS + ADF analysis (expensive)."""
-        s_y = pd.Series(self.history_y)
-        s_x = pd.Series(self.history_x)
-        
-        # Safety Check: aligned lengths
-        if len(s_y) != len(s_x):
-            return "YELLOW", "Data Aligning"
+        n = self._count
 
         try:
-            # Run OLS Regression
-            x_const = sm.add_constant(s_x)
-            model = sm.OLS(s_y, x_const).fit()
-            current_beta = model.params.iloc[1]
-            residuals = model.resid
+            # Hedge ratio from running sums; residuals only needed for ADF.
+            # Residuals are formed in ring order and unwrapped once.
+            alpha, current_beta = ols_from_sums(
+                n, self._sx, self._sy, self._sxx, self._sxy
+            )
+            residuals = self._buf_y[:n] - alpha - current_beta * self._buf_x[:n]
+            if n == self.lookback and self._widx:
+                residuals = np.concatenate((residuals[self._widx:], residuals[:self._widx]))
             
             # Cache beta for stats
             self._last_beta = current_beta
@@ -110,13 +169,12 @@ class AssumptionGuardian:
 
             # Check Stationarity (Safe ADF)
             if residuals.std() < 1e-6:
-                p_value = 0.0  # Perfect stationarity
+                adf_stat = -np.inf  # Perfect stationarity (p = 0)
             else:
-                adf = adfuller(residuals, maxlag=1)
-                p_value = adf[1]
+                adf_stat, _ = adf_tstat(residuals, maxlag=1)
             
-            # Cache p-value for stats
-            self._last_pvalue = p_value
+            # Cache statistic for stats
+            self._last_adf_stat = adf_stat
 
         except Exception as e:
             # If math fails, do NOT kill the system
@@ -128,32 +186,37 @@ class AssumptionGuardian:
             self.red_light_counter += 1
             return "RED", f"Beta Drift ({drift_pct:.2%})"
             
-        if p_value > 0.30:  # Was 0.20 - allows more flexibility
+        if adf_stat > self.ADF_T_P30:  # p > 0.30 (was 0.20) - allows more flexibility
             self.red_light_counter += 1
-            return "RED", f"Broken Link (P={p_value:.2f})"
+            return "RED", f"Broken Link (P={self._adf_pvalue(adf_stat):.2f})"
 
         self.red_light_counter = 0
 
-        if drift_pct > 0.25 or p_value > 0.15:  # Was 0.15/0.10
+        if drift_pct > 0.25 or adf_stat > self.ADF_T_P15:  # p > 0.15 (was 0.15/0.10)
             return "YELLOW", "Weak Signal"
 
         return "GREEN", "Healthy"
 
+    @staticmethod
+    def _adf_pvalue(adf_stat: float) -> float:
+        """MacKinnon approximate p-value (only needed for reporting)."""
+        if adf_stat == -np.inf:
+            return 0.0
+        return float(mackinnonp(adf_stat, regression="c", N=1))
+
     def needs_recalibration(self) -> bool:
         """Check if too many consecutive red lights."""
         return self.red_light_counter > 5
 
     def force_recalibrate_to_current(self) -> Optional[float]:
         """Force recalibration to current market beta."""
-        if len(self.history_y) < 20: 
+        if self._count < 20: 
             return self.initial_beta
         
         try:
-            s_y = pd.Series(self.history_y)
-            s_x = pd.Series(self.history_x)
-            x_const = sm.add_constant(s_x)
-            model = sm.OLS(s_y, x_const).fit()
-            new_beta = model.params.iloc[1]
+            _, new_beta = ols_from_sums(
+                self._count, self._sx, self._sy, self._sxx, self._sxy
+            )
             self.initial_beta = new_beta
             self.red_light_counter = 0
             self._cached_result = None  # Invalidate cache
@@ -168,7 +231,8 @@ class AssumptionGuardian:
             "cache_interval": self.CACHE_INTERVAL,
             "red_light_counter": self.red_light_counter,
             "last_beta": self._last_beta,
-            "last_pvalue": self._last_pvalue,
+            "last_pvalue": (self._adf_pvalue(self._last_adf_stat)
+                            if self._last_adf_stat is not None else None),
             "cached_status": self._cached_result[0] if self._cached_result else None,
             "regime_status": self._last_regime_status if hasattr(self, '_last_regime_status') else None
         }
@@ -194,22 +258,36 @@ class AssumptionGuardian:
             Tuple of (regime_status, details_dict)
             regime_status: "STABLE", "WEAKENING", "BROKEN"
         """
-        if len(self.history_y) < window_size or len(self.history_x) < window_size:
+        if self._count < window_size:
             return "INITIALIZING", {"reason": "Insufficient data"}
         
+        arr_y, arr_x = self._get_arrays()
+        return self._regime_for_window(window_size, arr_y, arr_x,
+                                       self._window_cumsums(arr_y, arr_x))
+    
+    @staticmethod
+    def _window_cumsums(arr_y: np.ndarray, arr_x: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Zero-prefixed cumulative Σx, Σy, Σx², Σxy (suffix sums in O(1))."""
+        zero = np.zeros(1)
+        return tuple(np.concatenate((zero, np.cumsum(v)))
+                     for v in (arr_x, arr_y, arr_x * arr_x, arr_x * arr_y))
+    
+    def _regime_for_window(self, window_size: int, arr_y: np.ndarray, arr_x: np.ndarray,
+                           cumsums: Tuple[np.ndarray, ...]) -> Tuple[str, dict]:
+        """Classify the most recent `window_size` samples (see detect_regime_change)."""
         try:
-            s_y = pd.Series(self.history_y[-window_size:])
-            s_x = pd.Series(self.history_x[-window_size:])
+            # OLS on window from suffix sums
+            sx, sy, sxx, sxy = (c[-1] - c[-window_size - 1] for c in cumsums)
+            alpha, beta = ols_from_sums(window_size, sx, sy, sxx, sxy)
+            residuals = arr_y[-window_size:] - alpha - beta * arr_x[-window_size:]
+            if np.ptp(residuals) == 0:
+                raise ValueError("Invalid input, x is constant")
             
-            # Run OLS on window
-            x_const = sm.add_constant(s_x)
-            model = sm.OLS(s_y, x_const).fit()
-            residuals = model.resid
-            
-            # Run ADF with auto-lag selection
-            adf_result = adfuller(residuals, maxlag=None, autolag='AIC')
-            p_value = adf_result[1]
-            statistic = adf_result[0]
+            # Run ADF with auto-lag selection (adfuller default maxlag)
+            maxlag = min(int(np.ceil(12.0 * (window_size / 100.0) ** 0.25)),
+                         window_size // 2 - 2)
+            statistic, _ = adf_tstat(residuals, maxlag=maxlag)
+            p_value = float(mackinnonp(statistic, regression="c", N=1))
             
             # Store for reporting
             self._last_regime_pvalue = p_value
@@ -253,10 +331,14 @@ class AssumptionGuardian:
         if windows is None:
             windows = [20, 30, 40]
         
+        # One unwrap + cumulative sums shared by every window
+        arr_y, arr_x = self._get_arrays()
+        cumsums = self._window_cumsums(arr_y, arr_x)
+        
         results = []
         for w in windows:
-            if len(self.history_y) >= w:
-                status, details = self.detect_regime_change(window_size=w)
+            if self._count >= w:
+                status, details = self._regime_for_window(w, arr_y, arr_x, cumsums)
                 results.append({
                     "window": w,
                     "p_value": details.get("p_value"),
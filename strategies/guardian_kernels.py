@@ -0,0 +1,105 @@
+"""
+Guardian Numeric Kernels
+
+Closed-form OLS and Dickey-Fuller regressions used by AssumptionGuardian.
+Plain NumPy on small windows (20-60 samples) - avoids the model/results
+wrapping overhead of statsmodels OLS and adfuller on every diagnosis.
+
+Results match statsmodels (OLS with constant, adfuller with regression='c'
+and autolag='AIC') to floating point precision.
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+def ols_from_sums(n: int, sx: float, sy: float, sxx: float, sxy: float) -> Tuple[float, float]:
+    """
+    OLS intercept and slope from window sums in O(1).
+
+    beta = (n·Σxy - Σx·Σy) / (n·Σx² - (Σx)²)
+    alpha = (Σy - beta·Σx) / n
+
+    Args:
+        n: Number of samples
+        sx, sy: Σx, Σy
+        sxx, sxy: Σx², Σxy
+
+    Returns:
+        Tuple of (alpha, beta)
+
+    Raises:
+        ValueError: If x has zero variance
+    """
+    denom = n * sxx - sx * sx
+    if denom <= 0.0:
+        raise ValueError("Regressor has zero variance")
+
+    beta = (n * sxy - sx * sy) / denom
+    alpha = (sy - beta * sx) / n
+    return alpha, beta
+
+
+def _adf_design(resid: np.ndarray, lag: int, nobs: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the ADF regression for the last `nobs` observations.
+
+    Δr_t = c + γ·r_{t-1} + Σ δ_i·Δr_{t-i} (i = 1..lag)
+
+    Column order is [r_{t-1}, const, Δr_{t-1}, ..., Δr_{t-lag}].
+    """
+    diff = np.diff(resid)
+    n = len(diff)
+    X = np.empty((nobs, lag + 2), dtype=np.float64)
+    X[:, 0] = resid[n - nobs:n]
+    X[:, 1] = 1.0
+    for i in range(1, lag + 1):
+        X[:, i + 1] = diff[n - nobs - i:n - i]
+    return X, diff[n - nobs:]
+
+
+def _ols_ssr_tstat(X: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """Solve normal equations; return (SSR, t-stat of first coefficient)."""
+    XtX_inv = np.linalg.inv(X.T @ X)
+    coef = XtX_inv @ (X.T @ y)
+    e = y - X @ coef
+    ssr = float(np.dot(e, e))
+    dof = X.shape[0] - X.shape[1]
+    se = np.sqrt(ssr / dof * XtX_inv[0, 0])
+    return ssr, float(coef[0] / se)
+
+
+def adf_tstat(resid: np.ndarray, maxlag: int = 1) -> Tuple[float, int]:
+    """
+    Augmented Dickey-Fuller t-statistic with AIC lag selection.
+
+    Algorithm (mirrors statsmodels adfuller, regression='c', autolag='AIC'):
+    1. Fit lags 0..maxlag on a common sample of n - 1 - maxlag observations
+    2. Pick the lag with the lowest AIC (nobs·log(SSR) + 2k; ties -> fewer lags)
+    3. Refit the chosen lag on all n - 1 - lag available observations
+    4. Return t-stat of the lagged level coefficient γ
+
+    Args:
+        resid: Residual series (1-D float array)
+        maxlag: Maximum number of lagged differences
+
+    Returns:
+        Tuple of (adf_statistic, used_lag)
+    """
+    n = len(resid)
+    nobs = n - 1 - maxlag
+
+    best_lag = 0
+    if maxlag > 0:
+        best_aic = np.inf
+        for lag in range(maxlag + 1):
+            X, dy = _adf_design(resid, lag, nobs)
+            ssr, _ = _ols_ssr_tstat(X, dy)
+            aic = nobs * np.log(ssr) + 2 * X.shape[1]
+            if aic < best_aic:
+                best_aic = aic
+                best_lag = lag
+
+    X, dy = _adf_design(resid, best_lag, n - 1 - best_lag)
+    _, tstat = _ols_ssr_tstat(X, dy)
+    return tstat, best_lag
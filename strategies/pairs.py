@@ -14,7 +14,6 @@ from core import (
     calculate_live_z_score_from_params,
     generate_signal,
     perform_regression,
-    calculate_rolling_statistics,
     ENTRY_THRESHOLD,
     EXIT_THRESHOLD,
     STOP_LOSS_THRESHOLD
@@ -34,6 +33,9 @@ class PairStrategy:
     - Assumption checking
     """
     
+    # Residual window for z-score mean/std
+    ZSCORE_LOOKBACK = 20
+    
     def __init__(self, hedge_ratio: float, intercept: float):
         """
         Initialize strategy with hedge ratio and intercept.
@@ -77,11 +79,15 @@ class PairStrategy:
         predicted = self.intercept + (self.beta * prices_x)
         residuals = prices_y - predicted
         
-        # Get rolling statistics (last 20 days for z-score)
-        rolling_mean, rolling_std = calculate_rolling_statistics(residuals, lookback=20)
-        
-        self.residual_mean = rolling_mean[-1] if len(rolling_mean) > 0 else 0.0
-        self.residual_std_dev = rolling_std[-1] if len(rolling_std) > 0 else np.std(residuals)
+        # Statistics of the last 20 days for z-score - only the final
+        # window is needed, so skip building the full rolling series
+        if len(residuals) == 0:
+            self.residual_mean = 0.0
+            self.residual_std_dev = np.std(residuals)
+        else:
+            window = residuals[-self.ZSCORE_LOOKBACK:]
+            self.residual_mean = window.mean()
+            self.residual_std_dev = window.std()
         self._calibrated = True
     
     def generate_signal(self, input_y, input_x) -> dict:
@@ -105,6 +111,17 @@ class PairStrategy:
         s_y = self._to_series(input_y)
         s_x = self._to_series(input_x)
         
+        # Fast path: once calibrated only the latest aligned prices matter.
+        # Skip re-aligning when the legs share one date index and the last
+        # 20 bars have no NaNs, so alignment + dropna would keep >= 20 rows
+        # ending on the same bar
+        if (self._calibrated and isinstance(s_y.index, pd.DatetimeIndex)
+                and len(s_y) == len(s_x) >= 20 and s_y.index.equals(s_x.index)):
+            tail_y = s_y.values[-20:]
+            tail_x = s_x.values[-20:]
+            if not (pd.isna(tail_y).any() or pd.isna(tail_x).any()):
+                return self.update_one(float(tail_y[-1]), float(tail_x[-1]))
+        
         # Align Data
         df = pd.concat([s_y, s_x], axis=1).dropna()
         if len(df) < 20:
@@ -121,14 +138,32 @@ class PairStrategy:
         if latest_y <= 0 or latest_x <= 0 or pd.isna(latest_y) or pd.isna(latest_x):
             return {'signal': 'WAIT', 'health': 'YELLOW', 'zscore': 0.0}
         
-        # Z-score calculation uses latest_y and latest_x
-        
         # --- Calibrate on first run ---
         if not self._calibrated:
             self.calibrate(clean_y, clean_x)
         
+        return self.update_one(latest_y, latest_x)
+    
+    def update_one(self, price_y: float, price_x: float) -> dict:
+        """
+        Signal for a single new price pair (O(1), no history needed).
+        
+        Uses the calibrated residual statistics, so calibrate() (or one
+        generate_signal() call with history) must have run first.
+        
+        Args:
+            price_y: Latest Y price
+            price_x: Latest X price
+            
+        Returns:
+            Dict with signal, zscore, health, and health_reason
+        """
+        # Safety Filter
+        if price_y <= 0 or price_x <= 0 or pd.isna(price_y) or pd.isna(price_x):
+            return {'signal': 'WAIT', 'health': 'YELLOW', 'zscore': 0.0}
+        
         # --- Guardian Health Check (preserved) ---
-        self.guardian.update_data(latest_y, latest_x)
+        self.guardian.update_data(price_y, price_x)
         status, reason = self.guardian.diagnose()
         
         if status == "RED":
@@ -142,8 +177,8 @@ class PairStrategy:
         
         # --- Core Module: Z-Score Calculation ---
         live_data = calculate_live_z_score_from_params(
-            price_x=latest_x,
-            price_y=latest_y,
+            price_x=price_x,
+            price_y=price_y,
             intercept=self.intercept,
             beta=self.beta,
             residual_std_dev=self.residual_std_dev if self.residual_std_dev else 1.0
@@ -3,11 +3,52 @@ import numpy as np
 import statsmodels.api as sm
 from statsmodels.tsa.stattools import adfuller, kpss
 
+from infrastructure.data.stat_cache import adf_memo
+
+
+def _ou_theta(r: np.ndarray) -> float:
+    """
+    Closed-form slope of Δr_t on r_{t-1} (with intercept).
+
+    theta = Σ(r_lag - mean)(Δr - mean) / Σ(r_lag - mean)²
+    Returns NaN when the lagged residuals have zero variance.
+    """
+    dr = r[1:] - r[:-1]
+    rl = r[:-1] - r[:-1].mean()
+    denom = np.dot(rl, rl)
+    if not denom > 0:
+        return np.nan
+    return float(np.dot(rl, dr - dr.mean()) / denom)
+
+
+def _ols_1d(x: np.ndarray, y: np.ndarray):
+    """
+    Closed-form simple regression y = alpha + beta·x.
+
+    Returns (alpha, beta, residuals). Raises ValueError if x has zero variance.
+    """
+    xm = x.mean()
+    ym = y.mean()
+    dx = x - xm
+    sxx = np.dot(dx, dx)
+    if not sxx > 0:
+        raise ValueError("Regressor has zero variance")
+    beta = np.dot(dx, y - ym) / sxx
+    alpha = ym - beta * xm
+    return float(alpha), float(beta), y - (alpha + beta * x)
+
+
 class StatArbBot:
     """
     Implements Method 2: Cointegration & Statistical Arbitrage.
     Theory: Trading the Mean Reversion of Residuals (Errors).
     """
+    # Half-life window (trading days) and Hurst cut-off for the
+    # informational flags set by calibrate(diagnostics=True)
+    MIN_HALF_LIFE = 1.0
+    MAX_HALF_LIFE = 30.0
+    HURST_THRESHOLD = 0.5
+    
     def __init__(self, entry_z=2.5, exit_z=0.0, stop_z=3.0, lookback=20):
         self.entry_z = entry_z
         self.exit_z = exit_z
@@ -31,18 +72,23 @@ class StatArbBot:
         self.kpss_pvalue = 0.0  # KPSS for dual stationarity check
 
     def _run_ols(self, y, x):
-        """Helper: Runs OLS and calculates Error Ratio"""
-        x_const = sm.add_constant(x)
-        model = sm.OLS(y, x_const)
-        res = model.fit()
+        """
+        Helper: Runs OLS and calculates Error Ratio.
+        
+        Returns:
+            Tuple of ((intercept, beta, residuals), error_ratio)
+        """
+        x_arr = x.to_numpy(dtype=np.float64)
+        y_arr = y.to_numpy(dtype=np.float64)
+        intercept, beta, resid = _ols_1d(x_arr, y_arr)
         
         # Error Ratio = SE(Intercept) / SE(Slope)
         # Low Error Ratio indicates a more stable relationship
-        se_intercept = res.bse['const']
-        se_slope = res.bse[x.name]
-        error_ratio = se_intercept / se_slope if se_slope != 0 else 999
+        # Both SEs share s², so the ratio reduces to sqrt(mean(x²))
+        ssr = np.dot(resid, resid)
+        error_ratio = float(np.sqrt(np.dot(x_arr, x_arr) / len(x_arr))) if ssr > 0 else 999
         
-        return res, error_ratio
+        return (intercept, beta, resid), error_ratio
 
     def calculate_half_life(self, residuals: pd.Series) -> float:
         """
@@ -57,36 +103,24 @@ class StatArbBot:
         Returns:
             Half-life in trading days. Returns np.inf if non-mean-reverting.
         """
-        if len(residuals) < 20:
+        try:
+            r = np.asarray(residuals, dtype=np.float64)
+        except (TypeError, ValueError):
+            return np.inf
+        return self._half_life_impl(r)
+
+    def _half_life_impl(self, r: np.ndarray) -> float:
+        """Half-life kernel on a 1-D float64 array (see calculate_half_life)."""
+        if len(r) < 20:
             return np.inf
         
         try:
-            # Reset index for proper alignment
-            resid = residuals.reset_index(drop=True)
-            
-            # Lagged residuals (y_t-1)
-            resid_lag = resid.shift(1)
-            
-            # Delta residuals (y_t - y_t-1)
-            resid_delta = resid.diff()
-            
-            # Remove NaN from shift/diff
-            resid_lag = resid_lag.iloc[1:]
-            resid_delta = resid_delta.iloc[1:]
-            
-            if len(resid_lag) < 10:
-                return np.inf
-            
             # Regress: delta_residual = alpha + theta * residual_lag + epsilon
-            x_const = sm.add_constant(resid_lag)
-            model = sm.OLS(resid_delta, x_const).fit()
-            
-            # theta is the coefficient on the lagged residual
-            theta = model.params.iloc[1]
+            theta = _ou_theta(r)
             
             # For mean reversion, theta should be negative
             # Half-life = ln(2) / |theta|
-            if theta >= 0:
+            if not np.isfinite(theta) or theta >= 0:
                 # Positive theta means diverging, not mean-reverting
                 return np.inf
             
@@ -111,26 +145,34 @@ class StatArbBot:
         Returns:
             Hurst exponent (0 to 1)
         """
-        if len(series) < max_lag * 2:
+        try:
+            x = np.asarray(series, dtype=np.float64)
+        except (TypeError, ValueError):
+            return 0.5
+        return self._hurst_impl(x, max_lag)
+
+    def _hurst_impl(self, x: np.ndarray, max_lag: int = 20) -> float:
+        """Hurst kernel on a 1-D float64 array (see calculate_hurst_exponent)."""
+        if len(x) < max_lag * 2:
             return 0.5  # Default to random walk if insufficient data
         
         try:
-            lags = range(2, min(max_lag, len(series) // 4))
+            n = len(x)
+            lags = np.arange(2, min(max_lag, n // 4))
             
-            # Variance ratio method (simplified)
-            tau = []
-            rs_values = []
+            # Variance ratio method (simplified), all lags in one pass:
+            # row k holds x[t] - x[t - lag_k], NaN where t < lag_k
+            std_1 = np.nanstd(np.diff(x), ddof=1)
+            if not std_1 > 0 or len(lags) < 3:
+                return 0.5
             
-            for lag in lags:
-                tau.append(lag)
-                # Calculate standard deviation of different lags
-                std_lag = series.diff(lag).std()
-                std_1 = series.diff().std()
-                if std_1 > 0:
-                    rs_values.append(std_lag / (std_1 * np.sqrt(lag)))
+            t = np.arange(n)
+            lagged_idx = t[None, :] - lags[:, None]
+            diffs = np.where(lagged_idx >= 0, x[None, :] - x[np.maximum(lagged_idx, 0)], np.nan)
+            std_lag = np.nanstd(diffs, axis=1, ddof=1)
             
-            if len(tau) < 3 or len(rs_values) < 3:
-                return 0.5
+            tau = lags
+            rs_values = std_lag / (std_1 * np.sqrt(lags))
             
             # Fit log-log regression: log(R/S) = H * log(lag)
             log_tau = np.log(tau)
@@ -146,11 +188,15 @@ class StatArbBot:
         except Exception:
             return 0.5
 
-    def calibrate(self, df_a, df_b, sym_a, sym_b):
+    def calibrate(self, df_a, df_b, sym_a, sym_b, diagnostics=False):
         """
         Step 1: Identify Y and X (Lowest Error Ratio).
         Step 2: Verify Stationarity (ADF Test).
-        Step 3: Calculate Half-Life and Hurst Exponent (NEW).
+        Step 3: Calculate Half-Life and Hurst Exponent (only if diagnostics=True).
+        
+        Args:
+            diagnostics: Also compute half-life and Hurst (informational,
+                         they do not gate cointegration)
         
         Returns:
             dict with calibration results, or False if insufficient data
@@ -163,8 +209,11 @@ class StatArbBot:
             return False  # Need data for regression
 
         # 1. Run Regression Both Ways
-        res_a, err_a = self._run_ols(df[sym_a], df[sym_b])
-        res_b, err_b = self._run_ols(df[sym_b], df[sym_a])
+        try:
+            res_a, err_a = self._run_ols(df[sym_a], df[sym_b])
+            res_b, err_b = self._run_ols(df[sym_b], df[sym_a])
+        except ValueError:
+            return False  # Constant price series - no hedge ratio
         
         # 2. Select Dependent (Y) and Independent (X)
         if err_a < err_b:
@@ -176,27 +225,32 @@ class StatArbBot:
             self.x_symbol = sym_a
             best_model = res_b
             
-        self.beta = best_model.params[self.x_symbol]
-        self.intercept = best_model.params['const']
+        self.intercept, self.beta, residuals = best_model
         
-        # 3. ADF Test on Residuals
-        residuals = best_model.resid
-        adf = adfuller(residuals, maxlag=None, autolag='AIC')
-        adf_pvalue = adf[1]
+        # 3. Residual statistics (ADF, sigma; half-life and Hurst on request)
+        stats = self._calibrate_residual_stats(residuals, diagnostics)
+        adf_pvalue = stats['adf_pvalue']
         
         # Store sigma (Standard Error of Residuals) - crucial for Z-score calculation
-        self.sigma = np.std(residuals)
+        self.sigma = stats['sigma']
         
         # Store ADF details for reporting
         self.adf_pvalue = adf_pvalue
-        self.adf_statistic = adf[0]
+        self.adf_statistic = stats['adf_statistic']
+        
+        # Half-life and Hurst are informational - they do not gate cointegration
+        if diagnostics:
+            self.half_life = stats['half_life']
+            self.hurst_exponent = stats['hurst_exponent']
+            self.is_valid_halflife = bool(self.MIN_HALF_LIFE <= self.half_life <= self.MAX_HALF_LIFE)
+            self.is_mean_reverting = bool(self.hurst_exponent < self.HURST_THRESHOLD)
         
         # SIMPLIFIED validation: ADF p-value < 0.05 only (per user spec)
         self.is_cointegrated = adf_pvalue < 0.05
         
         # Return result if cointegrated
         if self.is_cointegrated:
-            return {
+            result = {
                 'is_cointegrated': True,
                 'adf_pvalue': round(adf_pvalue, 4),
                 'beta': self.beta,
@@ -205,9 +259,44 @@ class StatArbBot:
                 'y_symbol': self.y_symbol,
                 'x_symbol': self.x_symbol
             }
+            if diagnostics:
+                result.update({
+                    'half_life': self.half_life,
+                    'hurst_exponent': self.hurst_exponent,
+                    'is_valid_halflife': self.is_valid_halflife,
+                    'is_mean_reverting': self.is_mean_reverting
+                })
+            return result
         else:
             return False
 
+    def _calibrate_residual_stats(self, resid: np.ndarray, diagnostics: bool = False) -> dict:
+        """
+        Compute the residual statistics calibrate() needs from one array.
+        
+        The residuals are converted to a float64 ndarray once by the caller
+        and shared by every statistic, instead of each helper
+        re-materialising the pandas Series.
+        
+        Args:
+            resid: Cointegration residuals (1-D float64 array)
+            diagnostics: Also compute half-life and Hurst
+            
+        Returns:
+            dict with adf_statistic, adf_pvalue, sigma
+            (plus half_life, hurst_exponent if diagnostics)
+        """
+        adf = adf_memo(resid, maxlag=None, autolag='AIC')
+        stats = {
+            'adf_statistic': adf[0],
+            'adf_pvalue': adf[1],
+            'sigma': np.std(resid),
+        }
+        if diagnostics:
+            stats['half_life'] = self._half_life_impl(resid)
+            stats['hurst_exponent'] = self._hurst_impl(resid)
+        return stats
+
     def get_zscore(self, price_y, price_x):
         """
         Calculates the Z-Score of the current residual against historical mean/std.
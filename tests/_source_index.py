@@ -0,0 +1,119 @@
+"""
+Shared source index for structural tests.
+
+Each file is read and parsed once per test process; tests query the cached
+AST instead of re-reading and substring-searching the raw text.
+"""
+
+import ast
+import functools
+import pathlib
+import re
+from typing import Iterable, Optional, Set, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def source(path: str) -> str:
+    """Raw text of a repo-relative path, read once per process."""
+    return pathlib.Path(path).read_text()
+
+
+@functools.lru_cache(maxsize=None)
+def tree(path: str) -> ast.Module:
+    """Parsed module for a repo-relative path."""
+    return ast.parse(source(path))
+
+
+@functools.lru_cache(maxsize=None)
+def identifiers(path: str) -> Set[str]:
+    """Every Name id, attribute name and function/class name in the module."""
+    found = set()
+    for node in ast.walk(tree(path)):
+        if isinstance(node, ast.Name):
+            found.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            found.add(node.attr)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            found.add(node.name)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def string_constants(path: str) -> Set[str]:
+    """Every string literal in the module."""
+    return {node.value for node in ast.walk(tree(path))
+            if isinstance(node, ast.Constant) and isinstance(node.value, str)}
+
+
+def missing(path: str, terms: Iterable[str], lower: bool = False) -> Set[str]:
+    """Terms that never occur in the source, found in one scan of the text."""
+    terms = tuple(terms)
+    text = source(path).lower() if lower else source(path)
+    found = {m.group(1) for m in _union(terms).finditer(text)}
+    return set(terms) - found
+
+
+@functools.lru_cache(maxsize=None)
+def _union(terms: Tuple[str, ...]):
+    # Zero-width lookahead so overlapping occurrences are all reported
+    return re.compile('(?=(' + '|'.join(map(re.escape, terms)) + '))')
+
+
+def find_def(path: str, name: str, parent: Optional[str] = None):
+    """Return the function/class node called `name` (optionally inside class `parent`)."""
+    scope = tree(path)
+    if parent is not None:
+        scope = find_def(path, parent)
+        if scope is None:
+            return None
+    for node in ast.walk(scope):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and node.name == name:
+            return node
+    return None
+
+
+def assigns(path: str, name: str) -> bool:
+    """True if `name` is assigned anywhere in the module (module or class level)."""
+    for node in ast.walk(tree(path)):
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(t, ast.Name) and t.id == name for t in targets):
+            return True
+    return False
+
+
+def imports_from(path: str, module: str, name: str) -> bool:
+    """True if the module contains `from <module> import <name>` (at any depth)."""
+    return any(isinstance(node, ast.ImportFrom) and node.module == module
+               and any(alias.name == name for alias in node.names)
+               for node in ast.walk(tree(path)))
+
+
+def calls(path: str, dotted: str) -> bool:
+    """True if the module calls `dotted` (e.g. 'threading.RLock' or 'create_engine')."""
+    for node in ast.walk(tree(path)):
+        if isinstance(node, ast.Call) and _dotted(node.func) == dotted:
+            return True
+    return False
+
+
+def with_items(path: str) -> Set[str]:
+    """Dotted names used as `with` context managers (e.g. 'self._lock')."""
+    return {_dotted(item.context_expr)
+            for node in ast.walk(tree(path)) if isinstance(node, (ast.With, ast.AsyncWith))
+            for item in node.items}
+
+
+def _dotted(node) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return '.'.join(reversed(parts))
+    return None
@@ -1,73 +1,88 @@
 """
 Unit Tests for Audit Fixes
 Tests the critical compliance fixes identified in the codebase audit.
-These tests are designed to run WITHOUT external dependencies (kiteconnect, pandas).
+Compliance checks import the modules they inspect and skip cleanly
+if an external dependency (kiteconnect, pandas, google-genai) is missing.
 """
 
 import sys
 import os
 import unittest
-import re
+import importlib
+import inspect
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+try:
+    from trading_floor.risk.sizing import (
+        check_margin_availability,
+        get_futures_margin,
+        calculate_kelly_percentage,
+        get_optimal_quantity,
+    )
+    _SIZING_ERROR = None
+except ImportError as e:
+    _SIZING_ERROR = str(e)
 
+
+def _import(name):
+    """Import a module under test, skipping if its dependencies are missing."""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise unittest.SkipTest(f"{name} unavailable: {e}")
+
+
+@unittest.skipIf(_SIZING_ERROR, f"sizing unavailable: {_SIZING_ERROR}")
 class TestMarginFunctions(unittest.TestCase):
     """Test Fix #3: Margin check functions in sizing.py"""
     
-    def setUp(self):
-        from trading_floor.risk.sizing import check_margin_availability, get_futures_margin
-        self.check_margin = check_margin_availability
-        self.get_margin = get_futures_margin
-    
     def test_margin_sufficient(self):
         """Test when equity exceeds margin + buffer"""
-        is_ok, msg = self.check_margin(equity=100000, initial_margin=50000, m2m_buffer_pct=0.20)
+        is_ok, msg = check_margin_availability(equity=100000, initial_margin=50000, m2m_buffer_pct=0.20)
         self.assertTrue(is_ok)
         self.assertIn("Margin OK", msg)
     
     def test_margin_insufficient(self):
         """Test when equity is below required margin"""
-        is_ok, msg = self.check_margin(equity=50000, initial_margin=60000, m2m_buffer_pct=0.20)
+        is_ok, msg = check_margin_availability(equity=50000, initial_margin=60000, m2m_buffer_pct=0.20)
         self.assertFalse(is_ok)
         self.assertIn("INSUFFICIENT", msg)
     
     def test_margin_exact_buffer(self):
         """Test edge case: equity exactly equals margin + 20% buffer"""
         # 50000 * 1.2 = 60000
-        is_ok, msg = self.check_margin(equity=60000, initial_margin=50000, m2m_buffer_pct=0.20)
+        is_ok, msg = check_margin_availability(equity=60000, initial_margin=50000, m2m_buffer_pct=0.20)
         self.assertTrue(is_ok)
     
     def test_futures_margin_calculation(self):
         """Test margin estimation for futures position"""
         # 100 qty * 1000 price * 15% = 15000
-        margin = self.get_margin(symbol="NIFTY25JANFUT", qty=100, price=1000, margin_pct=0.15)
+        margin = get_futures_margin(symbol="NIFTY25JANFUT", qty=100, price=1000, margin_pct=0.15)
         self.assertEqual(margin, 15000)
     
     def test_futures_margin_custom_pct(self):
         """Test with custom margin percentage"""
-        margin = self.get_margin(symbol="BANKNIFTY", qty=50, price=500, margin_pct=0.20)
+        margin = get_futures_margin(symbol="BANKNIFTY", qty=50, price=500, margin_pct=0.20)
         self.assertEqual(margin, 5000)  # 50 * 500 * 0.20
 
 
+@unittest.skipIf(_SIZING_ERROR, f"sizing unavailable: {_SIZING_ERROR}")
 class TestPositionSizing(unittest.TestCase):
     """Test existing position sizing functions"""
     
     def test_kelly_percentage_positive_edge(self):
-        from trading_floor.risk.sizing import calculate_kelly_percentage
         # W=0.6, R=2 -> Kelly = 0.6 - ((1-0.6)/2) = 0.6 - 0.2 = 0.4
         kelly = calculate_kelly_percentage(win_rate=0.6, reward_to_risk=2.0)
         self.assertAlmostEqual(kelly, 0.4, places=2)
     
     def test_kelly_percentage_negative_edge(self):
-        from trading_floor.risk.sizing import calculate_kelly_percentage
         # W=0.3, R=1 -> Kelly = 0.3 - 0.7 = -0.4 -> capped at 0
         kelly = calculate_kelly_percentage(win_rate=0.3, reward_to_risk=1.0)
         self.assertEqual(kelly, 0)
     
     def test_optimal_quantity_calculation(self):
-        from trading_floor.risk.sizing import get_optimal_quantity
         # Entry 100, SL 90 -> risk/share = 10
         # Equity 100000, max_risk 2% = 2000
         # Kelly with W=0.5, R=2 = 0.25
@@ -83,74 +98,67 @@ class TestPositionSizing(unittest.TestCase):
 
 class TestSourceCodeCompliance(unittest.TestCase):
     """
-    Test source code compliance by reading files directly.
-    This avoids import issues from missing dependencies.
+    Test source code compliance by introspecting the modules.
+    Each test is skipped if its module's dependencies are not installed.
     """
     
-    def read_file(self, path):
-        """Helper to read source file"""
-        with open(path, 'r') as f:
-            return f.read()
-    
     def test_engine_uses_nrml(self):
         """Fix #1: Verify engine.py PRODUCT_TYPE is set to NRML"""
-        source = self.read_file('trading_floor/engine.py')
-        
-        # Find the PRODUCT_TYPE assignment
-        match = re.search(r'PRODUCT_TYPE\s*=\s*["\'](\w+)["\']', source)
-        self.assertIsNotNone(match, "PRODUCT_TYPE assignment not found")
-        self.assertEqual(match.group(1), "NRML", 
+        engine = _import('trading_floor.engine')
+        self.assertEqual(engine.PRODUCT_TYPE, "NRML",
                         "PRODUCT_TYPE should be 'NRML' for futures overnight positions")
     
     def test_kite_orders_has_exchange_param(self):
         """Fix #2: Verify place_order has exchange parameter"""
-        source = self.read_file('infrastructure/broker/kite_orders.py')
+        kite_orders = _import('infrastructure.broker.kite_orders')
         
         # Check function signature includes exchange
-        self.assertIn('exchange="NSE"', source,
-                     "place_order should have exchange='NSE' default parameter")
+        params = inspect.signature(kite_orders.place_order).parameters
+        self.assertIn('exchange', params)
+        self.assertEqual(params['exchange'].default, "NSE",
+                        "place_order should have exchange='NSE' default parameter")
         
         # Check NFO mapping exists
-        self.assertIn('EXCHANGE_NFO', source,
+        self.assertIn('EXCHANGE_NFO', inspect.getsource(kite_orders.place_order),
                      "Should map to EXCHANGE_NFO for futures")
     
     def test_execution_has_stop_loss_function(self):
         """Fix #4: Verify place_stop_loss_order function exists"""
-        source = self.read_file('trading_floor/execution.py')
+        execution = _import('trading_floor.execution')
         
-        # Check function definition exists
-        self.assertIn('def place_stop_loss_order', source,
-                     "ExecutionHandler should have place_stop_loss_order method")
+        # Check method exists
+        method = getattr(execution.ExecutionHandler, 'place_stop_loss_order', None)
+        self.assertTrue(callable(method),
+                       "ExecutionHandler should have place_stop_loss_order method")
         
         # Check it uses SL-M order type
-        self.assertIn('order_type="SL-M"', source,
+        self.assertIn('order_type="SL-M"', inspect.getsource(method),
                      "Stop loss should use SL-M order type for guaranteed fill")
     
     def test_gemini_schema_has_pe_roce(self):
         """Fix #5: Verify Gemini schema includes P/E and ROCE"""
-        source = self.read_file('infrastructure/llm/client.py')
+        client = _import('infrastructure.llm.client')
         
-        # Check schema has pe_ratio
+        # Schema is built inside analyze_fundamentals
+        source = inspect.getsource(client.GeminiAgent.analyze_fundamentals)
         self.assertIn('pe_ratio', source,
                      "Gemini schema should include pe_ratio field")
-        
-        # Check schema has roce_latest
         self.assertIn('roce_latest', source,
                      "Gemini schema should include roce_latest field")
     
     def test_sizing_has_margin_check(self):
         """Fix #3: Verify margin check functions exist"""
-        source = self.read_file('trading_floor/risk/sizing.py')
-        
-        # Check function definitions exist
-        self.assertIn('def check_margin_availability', source,
-                     "sizing.py should have check_margin_availability function")
+        sizing = _import('trading_floor.risk.sizing')
         
-        self.assertIn('def get_futures_margin', source,
-                     "sizing.py should have get_futures_margin function")
+        # Check functions exist
+        self.assertTrue(callable(getattr(sizing, 'check_margin_availability', None)),
+                       "sizing.py should have check_margin_availability function")
+        self.assertTrue(callable(getattr(sizing, 'get_futures_margin', None)),
+                       "sizing.py should have get_futures_margin function")
         
         # Check M2M buffer is used
-        self.assertIn('m2m_buffer', source,
+        params = inspect.signature(sizing.check_margin_availability).parameters
+        self.assertIn('m2m_buffer_pct', params,
                      "Should include M2M buffer in margin check")
 
 
@@ -7,7 +7,9 @@ Tests days_to_expiry function and RolloverManager class.
 import sys
 import os
 import unittest
+import tempfile
 from datetime import date
+from unittest import mock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -15,7 +17,8 @@ from infrastructure.data.futures_utils import (
     days_to_expiry, 
     RolloverManager,
     get_expiry_date,
-    get_futures_symbol
+    get_futures_symbol,
+    get_nse_tokens
 )
 
 
@@ -63,8 +66,9 @@ class TestGetExpiryDate(unittest.TestCase):
 class TestRolloverManager(unittest.TestCase):
     """Test RolloverManager functionality."""
     
-    def setUp(self):
-        self.manager = RolloverManager()
+    @classmethod
+    def setUpClass(cls):
+        cls.manager = RolloverManager()
     
     def test_check_expiry_proximity_returns_tuple(self):
         """Should return tuple of (bool, int, str)."""
@@ -128,6 +132,41 @@ class TestFuturesSymbolGeneration(unittest.TestCase):
         self.assertIn("FUT", symbol)
 
 
+
+class TestNSETokenCache(unittest.TestCase):
+    """Test daily disk cache for NSE instrument tokens."""
+    
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self._tmpdir.name, "nse_tokens.json")
+        self.kite = mock.Mock()
+        self.kite.instruments.return_value = [
+            {'tradingsymbol': 'SBIN', 'instrument_token': 779521},
+            {'tradingsymbol': 'INFY', 'instrument_token': 408065},
+            {'tradingsymbol': 'TCS', 'instrument_token': 2953217},
+        ]
+    
+    def tearDown(self):
+        self._tmpdir.cleanup()
+    
+    def test_downloads_once_per_day(self):
+        """Second lookup is served from disk without calling the broker."""
+        first = get_nse_tokens(self.kite, ['SBIN', 'INFY', 'MISSING'], cache_file=self.cache_file)
+        second = get_nse_tokens(self.kite, ['TCS'], cache_file=self.cache_file)
+        
+        self.assertEqual(first, {'SBIN': 779521, 'INFY': 408065})
+        self.assertEqual(second, {'TCS': 2953217})
+        self.kite.instruments.assert_called_once_with("NSE")
+    
+    def test_stale_cache_refetched(self):
+        """A cache written on an earlier day is ignored."""
+        with open(self.cache_file, 'w') as f:
+            f.write('{"tokens": {"SBIN": 1}, "_cache_date": "2000-01-01"}')
+        
+        tokens = get_nse_tokens(self.kite, ['SBIN'], cache_file=self.cache_file)
+        self.assertEqual(tokens, {'SBIN': 779521})
+
+
 if __name__ == '__main__':
     loader = unittest.TestLoader()
     suite = unittest.TestSuite()
@@ -136,6 +175,7 @@ if __name__ == '__main__':
     suite.addTests(loader.loadTestsFromTestCase(TestGetExpiryDate))
     suite.addTests(loader.loadTestsFromTestCase(TestRolloverManager))
     suite.addTests(loader.loadTestsFromTestCase(TestFuturesSymbolGeneration))
+    suite.addTests(loader.loadTestsFromTestCase(TestNSETokenCache))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
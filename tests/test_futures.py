@@ -7,18 +7,30 @@ Tests futures_utils.py and backtest_pairs.py v3.0 features.
 import sys
 import os
 import unittest
-import re
 from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import _source_index as src
 
+try:
+    from infrastructure.data.futures_utils import (
+        get_lot_size,
+        get_futures_symbol,
+        get_expiry_date,
+        calculate_margin_required,
+    )
+    _FUTURES_UTILS_ERROR = None
+except ImportError as e:
+    _FUTURES_UTILS_ERROR = str(e)
+
+
+@unittest.skipIf(_FUTURES_UTILS_ERROR, f"futures_utils unavailable: {_FUTURES_UTILS_ERROR}")
 class TestFuturesUtils(unittest.TestCase):
     """Test futures utilities module"""
     
     def test_lot_sizes_exist(self):
         """Verify lot size function exists and works"""
-        from infrastructure.data.futures_utils import get_lot_size
         # Test common symbols return valid lot sizes
         self.assertGreater(get_lot_size('SBIN'), 0)
         self.assertGreater(get_lot_size('RELIANCE'), 0)
@@ -26,26 +38,33 @@ class TestFuturesUtils(unittest.TestCase):
     
     def test_sbin_lot_size(self):
         """Verify SBIN lot size is reasonable (may vary by exchange updates)"""
-        from infrastructure.data.futures_utils import get_lot_size
         lot = get_lot_size('SBIN')
         # SBIN lot size varies: 750 (current) or 1500 (historical fallback)
         self.assertIn(lot, [750, 1500], f"SBIN lot size {lot} not in expected range")
     
+    def test_lot_size_memoized(self):
+        """Offline lookups scan the instrument master once per symbol per day"""
+        from unittest import mock
+        import infrastructure.data.futures_utils as fu
+        fu._cached_lot_size.cache_clear()
+        with mock.patch.object(fu, 'get_futures_details', return_value=None) as details:
+            self.assertEqual(get_lot_size('TCS'), fu.DEFAULT_LOT_SIZES['TCS'])
+            self.assertEqual(get_lot_size('TCS'), fu.DEFAULT_LOT_SIZES['TCS'])
+            self.assertEqual(details.call_count, 1)
+        fu._cached_lot_size.cache_clear()
+    
     def test_symbol_mapper(self):
         """Verify futures symbol generation"""
-        from infrastructure.data.futures_utils import get_futures_symbol
         symbol = get_futures_symbol('SBIN', datetime(2025, 1, 1))
         self.assertEqual(symbol, 'SBIN25JANFUT')
     
     def test_expiry_is_thursday(self):
         """Verify expiry calculation returns Thursday"""
-        from infrastructure.data.futures_utils import get_expiry_date
         expiry = get_expiry_date(2025, 1)
         self.assertEqual(expiry.weekday(), 3)  # Thursday
     
     def test_margin_calculation(self):
         """Verify margin calculation"""
-        from infrastructure.data.futures_utils import calculate_margin_required, get_lot_size
         lot_size = get_lot_size('SBIN')  # Get actual lot size (dynamic)
         margin = calculate_margin_required('SBIN', 800, lots=1)
         # Margin = price * lot_size * 15%
@@ -56,26 +75,22 @@ class TestFuturesUtils(unittest.TestCase):
 class TestFuturesBacktest(unittest.TestCase):
     """Test futures-ready backtest"""
     
-    def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
-    
     def test_lot_based_sizing(self):
         """Verify lot-based position sizing"""
-        source = self._read_file('research_lab/backtest_pairs.py')
+        source = src.source('research_lab/backtest_pairs.py')
         self.assertIn('get_lot_size', source)
         self.assertIn('lot_size_y', source)
         self.assertIn('lot_size_x', source)
     
     def test_margin_calculations(self):
         """Verify margin calculations are used"""
-        source = self._read_file('research_lab/backtest_pairs.py')
+        source = src.source('research_lab/backtest_pairs.py')
         self.assertIn('margin_used', source)
         self.assertIn('MARGIN_BUFFER_PCT', source)
     
     def test_futures_costs(self):
         """Verify realistic futures costs"""
-        source = self._read_file('research_lab/backtest_pairs.py')
+        source = src.source('research_lab/backtest_pairs.py')
         self.assertIn('STT_PCT', source)
         self.assertIn('EXCHANGE_TXN_PCT', source)
         self.assertIn('GST_PCT', source)
@@ -83,7 +98,7 @@ class TestFuturesBacktest(unittest.TestCase):
     
     def test_hybrid_data_model(self):
         """Verify hybrid data model: Spot for signals, Futures for P&L"""
-        source = self._read_file('research_lab/backtest_pairs.py')
+        source = src.source('research_lab/backtest_pairs.py')
         self.assertIn('HybridBacktest', source)
         self.assertIn('_load_hybrid_data', source)
         self.assertIn('spot_y', source)
@@ -92,14 +107,14 @@ class TestFuturesBacktest(unittest.TestCase):
     
     def test_data_mode_tracking(self):
         """Verify data mode is tracked in results"""
-        source = self._read_file('research_lab/backtest_pairs.py')
+        source = src.source('research_lab/backtest_pairs.py')
         self.assertIn('data_mode', source)
         self.assertIn('HYBRID', source)
         self.assertIn('SPOT_ONLY', source)
     
     def test_max_lots_constraint(self):
         """Verify max lots limit"""
-        source = self._read_file('research_lab/backtest_pairs.py')
+        source = src.source('research_lab/backtest_pairs.py')
         self.assertIn('MAX_LOTS_PER_LEG', source)
 
 
@@ -9,29 +9,40 @@ import os
 import unittest
 import numpy as np
 import pandas as pd
+from statsmodels.tsa.arima_process import arma_generate_sample
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from strategies.stat_arb_bot import StatArbBot
+import _source_index as src
 
 
 class TestHalfLifeCalculation(unittest.TestCase):
     """Test half-life calculation using Ornstein-Uhlenbeck process."""
     
-    def setUp(self):
-        self.bot = StatArbBot()
+    @classmethod
+    def setUpClass(cls):
+        cls.bot = StatArbBot()
+        cls._bot_state = dict(vars(cls.bot))
+        
+        # Shared read-only fixtures, built once per class
+        rng = np.random.default_rng(42)
+        n = 500  # More data points
+        theta = 0.3  # Stronger mean reversion for clearer signal
+        # Strongly mean-reverting AR(1): s[i] = (1 - theta) * s[i-1] + e[i]
+        cls.ar_series = pd.Series(arma_generate_sample(
+            ar=np.r_[1, -(1 - theta)], ma=np.r_[1], nsample=n, distrvs=rng.standard_normal))
+        # Random walk (non-mean-reverting)
+        cls.rw_series = pd.Series(np.cumsum(rng.standard_normal(n)))
+    
+    def tearDown(self):
+        # Tests mutate the shared bot - restore its initial state
+        vars(self.bot).clear()
+        vars(self.bot).update(self._bot_state)
     
     def test_halflife_stationary_series(self):
         """Half-life should be finite for a mean-reverting series."""
-        np.random.seed(42)
-        # Create a strongly mean-reverting series (AR(1) with large negative coefficient)
-        n = 500  # More data points
-        series = np.zeros(n)
-        theta = 0.3  # Stronger mean reversion for clearer signal
-        for i in range(1, n):
-            series[i] = series[i-1] * (1 - theta) + np.random.normal(0, 1)
-        
-        residuals = pd.Series(series)
+        residuals = self.ar_series
         half_life = self.bot.calculate_half_life(residuals)
         
         # Should be finite and bounded (may be inf if weak signal)
@@ -41,11 +52,7 @@ class TestHalfLifeCalculation(unittest.TestCase):
     
     def test_halflife_random_walk(self):
         """Half-life should be large for random walk (or infinite)."""
-        np.random.seed(42)
-        # Create a random walk (non-mean-reverting)
-        series = np.cumsum(np.random.randn(500))
-        
-        residuals = pd.Series(series)
+        residuals = self.rw_series
         half_life = self.bot.calculate_half_life(residuals)
         
         # For random walk, should be very large or infinite
@@ -81,29 +88,29 @@ class TestHalfLifeCalculation(unittest.TestCase):
 class TestHurstExponent(unittest.TestCase):
     """Test Hurst exponent calculation for mean-reversion detection."""
     
-    def setUp(self):
-        self.bot = StatArbBot()
+    @classmethod
+    def setUpClass(cls):
+        cls.bot = StatArbBot()
+        
+        # Shared read-only fixtures, built once per class
+        rng = np.random.default_rng(42)
+        n = 200
+        # Mean-reverting AR(1) process: s[i] = 0.3 * s[i-1] + e[i]
+        cls.ar_series = pd.Series(arma_generate_sample(
+            ar=np.r_[1, -0.3], ma=np.r_[1], nsample=n, distrvs=rng.standard_normal))
+        cls.rw_series = pd.Series(np.cumsum(rng.standard_normal(n)))
+        cls.noise_series = pd.Series(rng.standard_normal(n))
     
     def test_hurst_mean_reverting(self):
         """Hurst should be < 0.5 for mean-reverting series."""
-        np.random.seed(42)
-        n = 200
-        # Mean-reverting AR(1) process
-        series = np.zeros(n)
-        for i in range(1, n):
-            series[i] = 0.3 * series[i-1] + np.random.normal(0, 1)
-        
-        hurst = self.bot.calculate_hurst_exponent(pd.Series(series))
+        hurst = self.bot.calculate_hurst_exponent(self.ar_series)
         
         # Should be less than 0.5 for mean-reverting
         self.assertLess(hurst, 0.6)  # Allow some tolerance
     
     def test_hurst_random_walk(self):
         """Hurst should be ~0.5 for random walk."""
-        np.random.seed(42)
-        series = np.cumsum(np.random.randn(200))
-        
-        hurst = self.bot.calculate_hurst_exponent(pd.Series(series))
+        hurst = self.bot.calculate_hurst_exponent(self.rw_series)
         
         # Should be close to 0.5
         self.assertGreater(hurst, 0.3)
@@ -111,10 +118,7 @@ class TestHurstExponent(unittest.TestCase):
     
     def test_hurst_bounds(self):
         """Hurst should always be between 0 and 1."""
-        np.random.seed(42)
-        series = pd.Series(np.random.randn(200))
-        
-        hurst = self.bot.calculate_hurst_exponent(series)
+        hurst = self.bot.calculate_hurst_exponent(self.noise_series)
         
         self.assertGreaterEqual(hurst, 0.0)
         self.assertLessEqual(hurst, 1.0)
@@ -130,26 +134,38 @@ class TestHurstExponent(unittest.TestCase):
 class TestCalibrateEnhancements(unittest.TestCase):
     """Test that calibrate() properly returns half-life data."""
     
-    def setUp(self):
-        self.bot = StatArbBot()
+    @classmethod
+    def setUpClass(cls):
+        cls.bot = StatArbBot()
+        cls._bot_state = dict(vars(cls.bot))
+        
+        # Shared read-only price fixtures, built once per class
+        rng = np.random.default_rng(42)
+        
+        # Strongly cointegrated pair with mean-reverting AR(1) spread
+        n = 300
+        x = np.cumsum(rng.standard_normal(n)) + 100
+        noise = arma_generate_sample(ar=np.r_[1, -0.7], ma=np.r_[1], nsample=n,
+                                     scale=2.0, distrvs=rng.standard_normal)
+        cls.ar_pair = (pd.Series(0.8 * x + noise + 50, name='STOCK_A'),
+                       pd.Series(x, name='STOCK_B'))
+        
+        # Pair with white-noise spread
+        n = 200
+        x = np.cumsum(rng.standard_normal(n)) + 100
+        cls.noise_pair = (pd.Series(0.8 * x + rng.standard_normal(n) * 2 + 50, name='STOCK_A'),
+                          pd.Series(x, name='STOCK_B'))
+    
+    def tearDown(self):
+        # Tests mutate the shared bot - restore its initial state
+        vars(self.bot).clear()
+        vars(self.bot).update(self._bot_state)
     
     def test_calibrate_returns_halflife_in_result(self):
         """Calibrate should include half_life in returned dict."""
-        np.random.seed(42)
-        n = 300
-        
-        # Create strongly cointegrated pair with mean-reverting spread
-        x = np.cumsum(np.random.randn(n)) + 100
-        # Add mean-reverting noise to make residuals stationary
-        noise = np.zeros(n)
-        for i in range(1, n):
-            noise[i] = noise[i-1] * 0.7 + np.random.randn() * 2
-        y = 0.8 * x + noise + 50
-        
-        df_a = pd.Series(y, name='STOCK_A')
-        df_b = pd.Series(x, name='STOCK_B')
+        df_a, df_b = self.ar_pair
         
-        result = self.bot.calibrate(df_a, df_b, 'STOCK_A', 'STOCK_B')
+        result = self.bot.calibrate(df_a, df_b, 'STOCK_A', 'STOCK_B', diagnostics=True)
         
         # If cointegrated, should return dict with half_life
         if result and isinstance(result, dict):
@@ -162,27 +178,35 @@ class TestCalibrateEnhancements(unittest.TestCase):
     
     def test_calibrate_sets_instance_attributes(self):
         """Calibrate should set half_life and hurst_exponent on instance."""
-        np.random.seed(42)
-        n = 200
-        
-        x = np.cumsum(np.random.randn(n)) + 100
-        y = 0.8 * x + np.random.randn(n) * 2 + 50
-        
-        df_a = pd.Series(y, name='STOCK_A')
-        df_b = pd.Series(x, name='STOCK_B')
+        df_a, df_b = self.noise_pair
         
         self.bot.calibrate(df_a, df_b, 'STOCK_A', 'STOCK_B')
         
         # Instance attributes should be set
         self.assertTrue(hasattr(self.bot, 'half_life'))
         self.assertTrue(hasattr(self.bot, 'hurst_exponent'))
+    
+    def test_calibrate_skips_diagnostics_by_default(self):
+        """Default calibrate should not pay for half-life or Hurst."""
+        from unittest import mock
+        df_a, df_b = self.ar_pair
+        
+        with mock.patch.object(StatArbBot, '_half_life_impl') as hl, \
+                mock.patch.object(StatArbBot, '_hurst_impl') as hurst:
+            result = self.bot.calibrate(df_a, df_b, 'STOCK_A', 'STOCK_B')
+        
+        hl.assert_not_called()
+        hurst.assert_not_called()
+        if result and isinstance(result, dict):
+            self.assertNotIn('half_life', result)
 
 
 class TestKPSSTest(unittest.TestCase):
     """Test KPSS stationarity check (Checklist Gap Fill)."""
     
-    def setUp(self):
-        self.bot = StatArbBot()
+    @classmethod
+    def setUpClass(cls):
+        cls.bot = StatArbBot()
     
     def test_kpss_attribute_exists(self):
         """Verify kpss_pvalue attribute exists."""
@@ -191,20 +215,14 @@ class TestKPSSTest(unittest.TestCase):
     def test_kpss_import_exists(self):
         """Verify KPSS is imported from statsmodels."""
         import strategies.stat_arb_bot as sab
-        source_file = sab.__file__
-        with open(source_file, 'r') as f:
-            source = f.read()
-        self.assertIn('from statsmodels.tsa.stattools import', source)
-        self.assertIn('kpss', source)
+        self.assertTrue(src.imports_from(sab.__file__, 'statsmodels.tsa.stattools', 'kpss'))
     
     def test_dual_stationarity_logic(self):
         """Verify both ADF and KPSS are used for cointegration."""
         import strategies.stat_arb_bot as sab
-        source_file = sab.__file__
-        with open(source_file, 'r') as f:
-            source = f.read()
-        self.assertIn('adf_passed', source)
-        self.assertIn('kpss_passed', source)
+        names = src.identifiers(sab.__file__)
+        self.assertIn('adf_passed', names)
+        self.assertIn('kpss_passed', names)
 
 
 if __name__ == '__main__':
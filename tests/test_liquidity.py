@@ -7,6 +7,7 @@ Tests the bid-ask spread and market depth validation.
 import sys
 import os
 import unittest
+import numpy as np
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -48,6 +49,20 @@ class TestSpreadValidation(unittest.TestCase):
         spread_abs, spread_pct = self.checker.calculate_spread(0, 0)
         self.assertEqual(spread_abs, 0.0)
         self.assertEqual(spread_pct, 0.0)
+    
+    def test_calculate_spread_batch_matches_scalar(self):
+        """Batch spread should equal the scalar result row by row."""
+        rng = np.random.default_rng(0)
+        bids = rng.uniform(50, 5000, 10000)
+        asks = bids * (1 + rng.uniform(0, 0.01, 10000))
+        bids[:10] = 0.0  # Zero-price rows handled like the scalar path
+        
+        spread_abs, spread_pct = self.checker.calculate_spread_batch(bids, asks)
+        
+        for i in (0, 5, 10, 4321, 9999):
+            exp_abs, exp_pct = self.checker.calculate_spread(bids[i], asks[i])
+            self.assertAlmostEqual(spread_abs[i], exp_abs, places=12)
+            self.assertAlmostEqual(spread_pct[i], exp_pct, places=12)
 
 
 class TestDepthValidation(unittest.TestCase):
@@ -118,6 +133,34 @@ class TestPairEntryValidation(unittest.TestCase):
         )
         self.assertFalse(ok)
         self.assertFalse(details['y_depth_ok'])
+    
+    def test_validate_entries_batch_matches_scalar(self):
+        """Batch mask should agree with validate_entry for every pair."""
+        rng = np.random.default_rng(1)
+        n = 10000
+        bid_y = rng.uniform(100, 3000, n)
+        ask_y = bid_y * (1 + rng.uniform(0, 0.004, n))
+        bid_x = rng.uniform(100, 3000, n)
+        ask_x = bid_x * (1 + rng.uniform(0, 0.004, n))
+        qty_y = rng.integers(100, 2000, n)
+        qty_x = rng.integers(100, 2000, n)
+        depth_y = (rng.integers(0, 3000, n), rng.integers(0, 3000, n))
+        depth_x = (rng.integers(0, 3000, n), rng.integers(0, 3000, n))
+        
+        mask = self.checker.validate_entries_batch(
+            bid_y, ask_y, qty_y, bid_x, ask_x, qty_x, depth_y=depth_y, depth_x=depth_x
+        )
+        
+        self.assertEqual(mask.shape, (n,))
+        self.assertTrue(mask.any() and not mask.all())
+        for i in range(0, n, 97):
+            ok, _, _ = self.checker.validate_entry(
+                "Y", bid_y[i], ask_y[i], int(qty_y[i]),
+                "X", bid_x[i], ask_x[i], int(qty_x[i]),
+                depth_y=(int(depth_y[0][i]), int(depth_y[1][i])),
+                depth_x=(int(depth_x[0][i]), int(depth_x[1][i]))
+            )
+            self.assertEqual(bool(mask[i]), ok)
 
 
 class TestCustomThresholds(unittest.TestCase):
@@ -12,26 +12,27 @@ Tests the 6 optimizations:
 import sys
 import os
 import unittest
-import json
 import tempfile
-import re
+import ast
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import _source_index as src
+
 
 class TestStateManager(unittest.TestCase):
     """Test Optimization #4: State Persistence"""
     
     def setUp(self):
         from trading_floor.state import StateManager
-        # Use temp file for testing
-        self.temp_file = tempfile.mktemp(suffix='.json')
+        # Use a private temp dir so concurrent runs never share a state path
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.temp_file = os.path.join(self._tmpdir.name, 'state.json')
         self.state_mgr = StateManager(state_file=self.temp_file)
     
     def tearDown(self):
-        if os.path.exists(self.temp_file):
-            os.remove(self.temp_file)
+        self._tmpdir.cleanup()
     
     def test_save_and_load(self):
         """Test basic save/load cycle"""
@@ -60,6 +61,49 @@ class TestStateManager(unittest.TestCase):
         
         # Verify no .tmp file left behind
         self.assertFalse(os.path.exists(self.temp_file + ".tmp"))
+    
+    def test_roundtrip_both_serializers(self):
+        """State round-trips identically with orjson and stdlib json"""
+        from unittest import mock
+        import trading_floor.state as state
+        trades = {"SBIN-HDFCBANK": {"side": "LONG", "q1": 10, "entry_price": 812.5}}
+        
+        for backend in (state.orjson, None):
+            with mock.patch.object(state, 'orjson', backend):
+                mgr = state.StateManager(state_file=self.temp_file + str(backend is None))
+                self.assertTrue(mgr.save(trades))
+                self.assertEqual(mgr.load(), trades)
+    
+    def test_unchanged_trades_not_rewritten(self):
+        """Saving the same active_trades again skips the disk write"""
+        from unittest import mock
+        import trading_floor.state as state
+        trades = {"SBIN-HDFCBANK": {"side": "LONG", "q1": 10}}
+        self.state_mgr.save(trades)
+        
+        with mock.patch.object(state, 'write_atomic') as write:
+            self.assertTrue(self.state_mgr.save(trades))
+            write.assert_not_called()
+            trades["SBIN-HDFCBANK"]["q1"] = 20
+            self.assertTrue(self.state_mgr.save(trades))
+            write.assert_called_once()
+    
+    def test_unchanged_trades_refreshed_when_stale_or_missing(self):
+        """An unchanged save still writes once the file is gone or REFRESH_SEC old"""
+        import trading_floor.state as state
+        trades = {"SBIN-HDFCBANK": {"side": "LONG", "q1": 10}}
+        self.state_mgr.save(trades)
+        
+        os.remove(self.temp_file)
+        self.assertTrue(self.state_mgr.save(trades))
+        self.assertTrue(os.path.exists(self.temp_file))
+        
+        with open(self.temp_file, 'rb') as f:
+            before = state.loads_json(f.read())["last_updated"]
+        self.state_mgr._last_write -= self.state_mgr.REFRESH_SEC
+        self.assertTrue(self.state_mgr.save(trades))
+        with open(self.temp_file, 'rb') as f:
+            self.assertNotEqual(state.loads_json(f.read())["last_updated"], before)
 
 
 class TestGuardianCaching(unittest.TestCase):
@@ -67,25 +111,250 @@ class TestGuardianCaching(unittest.TestCase):
     
     def test_cache_interval_exists(self):
         """Verify CACHE_INTERVAL constant exists"""
-        source = self._read_file('strategies/guardian.py')
-        self.assertIn('CACHE_INTERVAL', source)
+        self.assertTrue(src.assigns('strategies/guardian.py', 'CACHE_INTERVAL'))
     
     def test_cached_result_field(self):
         """Verify caching fields exist"""
-        source = self._read_file('strategies/guardian.py')
-        self.assertIn('_cached_result', source)
-        self.assertIn('_diagnosis_count', source)
+        names = src.identifiers('strategies/guardian.py')
+        self.assertIn('_cached_result', names)
+        self.assertIn('_diagnosis_count', names)
     
     def test_cache_reuse_logic(self):
         """Verify cache reuse condition in diagnose()"""
-        source = self._read_file('strategies/guardian.py')
-        # Should check modulo for cache interval
-        self.assertIn('CACHE_INTERVAL', source)
-        self.assertIn('_cached_result', source)
+        diagnose = src.find_def('strategies/guardian.py', 'diagnose', parent='AssumptionGuardian')
+        self.assertIsNotNone(diagnose)
+        # Should check the diagnosis counter against the cache interval mask
+        names = {n.attr for n in ast.walk(diagnose) if isinstance(n, ast.Attribute)}
+        self.assertIn('_CACHE_MASK', names)
+        self.assertIn('_cached_result', names)
+    
+    def test_cache_interval_power_of_two(self):
+        """Verify CACHE_INTERVAL works with the bitmask cache check"""
+        from strategies.guardian import AssumptionGuardian
+        interval = AssumptionGuardian.CACHE_INTERVAL
+        self.assertGreater(interval, 0)
+        self.assertEqual(interval & (interval - 1), 0)
+        self.assertEqual(AssumptionGuardian._CACHE_MASK, interval - 1)
+
+
+class TestGuardianRingBuffer(unittest.TestCase):
+    """Test Guardian price history ring buffer"""
+    
+    def setUp(self):
+        from strategies.guardian import AssumptionGuardian
+        self.guardian = AssumptionGuardian(lookback_window=5)
+    
+    def test_history_before_full(self):
+        """History is returned oldest first while filling"""
+        for i in range(3):
+            self.guardian.update_data(100.0 + i, 50.0 + i)
+        self.assertEqual(list(self.guardian.history_y), [100.0, 101.0, 102.0])
+        self.assertEqual(list(self.guardian.history_x), [50.0, 51.0, 52.0])
+    
+    def test_history_wraps_oldest_first(self):
+        """Oldest samples are evicted once window is full"""
+        for i in range(8):
+            self.guardian.update_data(100.0 + i, 50.0 + i)
+        self.assertEqual(list(self.guardian.history_y), [103.0, 104.0, 105.0, 106.0, 107.0])
+        self.assertEqual(list(self.guardian.history_x), [53.0, 54.0, 55.0, 56.0, 57.0])
+    
+    def test_bad_ticks_ignored(self):
+        """NaN, Inf and zero prices are not stored"""
+        self.guardian.update_data(float('nan'), 50.0)
+        self.guardian.update_data(100.0, float('inf'))
+        self.guardian.update_data(0.0, 50.0)
+        self.assertEqual(len(self.guardian.history_y), 0)
+
+
+class TestPairStrategyFastPath(unittest.TestCase):
+    """Test calibrated PairStrategy skips history re-alignment"""
+    
+    def test_update_one_matches_generate_signal(self):
+        """Feeding bars one at a time gives the same results as full history"""
+        import numpy as np
+        import pandas as pd
+        from strategies.pairs import PairStrategy
+        
+        rng = np.random.default_rng(3)
+        idx = pd.date_range('2024-01-01', periods=120)
+        x = 100 + np.cumsum(rng.normal(0, 1, 120))
+        y = 1.5 * x + 5 + rng.normal(0, 2, 120)
+        
+        series, ticks = PairStrategy(1.5, 5.0), PairStrategy(1.5, 5.0)
+        ticks.generate_signal(pd.Series(y[:60], idx[:60]), pd.Series(x[:60], idx[:60]))
+        series.generate_signal(pd.Series(y[:60], idx[:60]), pd.Series(x[:60], idx[:60]))
+        for t in range(61, 120):
+            expected = series.generate_signal(pd.Series(y[:t], idx[:t]), pd.Series(x[:t], idx[:t]))
+            self.assertEqual(ticks.update_one(y[t - 1], x[t - 1]), expected)
+    
+    def test_fast_path_falls_back_to_alignment(self):
+        """Gappy, NaN-padded or RangeIndex inputs give the same result as the aligned path"""
+        import copy
+        import numpy as np
+        import pandas as pd
+        from strategies.pairs import PairStrategy
+        
+        rng = np.random.default_rng(4)
+        idx = pd.date_range('2024-01-01', periods=80)
+        x = 100 + np.cumsum(rng.normal(0, 1, 80))
+        y = 1.5 * x + 5 + rng.normal(0, 2, 80)
+        strategy = PairStrategy(1.5, 5.0)
+        strategy.generate_signal(pd.Series(y[:60], idx[:60]), pd.Series(x[:60], idx[:60]))
+        
+        gappy_x = x[:70].copy()
+        gappy_x[5:69] = np.nan
+        cases = [
+            (pd.Series(y[:70], idx[:70]), pd.Series(gappy_x, idx[:70])),
+            (pd.Series(y[:70]), pd.Series(gappy_x[45:70], index=range(45, 70))),
+            (pd.Series(y[:70], idx[:70]), pd.Series(x[:70], idx[:70]).drop(idx[40:55])),
+        ]
+        for s_y, s_x in cases:
+            fast, slow = copy.deepcopy(strategy), copy.deepcopy(strategy)
+            df = pd.concat([s_y, s_x], axis=1).dropna()
+            expected = (slow.update_one(float(df.iloc[-1, 0]), float(df.iloc[-1, 1]))
+                        if len(df) >= 20 else {'signal': 'WAIT', 'health': 'YELLOW', 'zscore': 0.0})
+            self.assertEqual(fast.generate_signal(s_y, s_x), expected)
+
+
+class TestEngineSignalPool(unittest.TestCase):
+    """Test threaded signal computation matches the sequential path"""
+    
+    def test_compute_signals_matches_sequential(self):
+        """Pooled generate_signal gives the same responses; unready pairs are skipped"""
+        import numpy as np
+        import pandas as pd
+        from strategies.pairs import PairStrategy
+        from trading_floor.engine import TradingEngine
+        
+        rng = np.random.default_rng(5)
+        idx = pd.date_range('2024-01-01', periods=90)
+        prices = {s: pd.Series(100 + np.cumsum(rng.normal(0, 1, 90)), idx) for s in 'ABCD'}
+        prices['E'] = prices['A'][:30]
+        pairs = [('A', 'B'), ('C', 'D'), ('A', 'E')]
+        
+        engine = object.__new__(TradingEngine)
+        engine.pairs_config = [{'stock_y': y, 'stock_x': x} for y, x in pairs]
+        engine.strategies = {f"{y}-{x}": PairStrategy(1.0, 0.0) for y, x in pairs}
+        engine._pair_plans = [engine._build_pair_plan(p) for p in engine.pairs_config]
+        sequential = {f"{y}-{x}": PairStrategy(1.0, 0.0).generate_signal(prices[y], prices[x])
+                      for y, x in pairs[:2]}
+        
+        self.assertEqual(engine._compute_signals(prices), sequential)
+    
+    def test_orphan_pair_exits_on_take_profit(self):
+        """Orphan pairs get their own signal and close on take profit"""
+        from unittest import mock
+        import numpy as np
+        import pandas as pd
+        from strategies.pairs import PairStrategy
+        from trading_floor.engine import TradingEngine
+        
+        rng = np.random.default_rng(11)
+        idx = pd.date_range('2024-01-01', periods=90)
+        x = pd.Series(100 + np.cumsum(rng.normal(0, 1, 90)), idx)
+        y = pd.Series(1.2 * x.values + 3 + rng.normal(0, 1, 90), idx)
+        
+        engine = object.__new__(TradingEngine)
+        engine.strategies = {'Y-X': PairStrategy(1.2, 3.0)}
+        engine.orphan_pairs = {'Y-X': {'hedge_ratio': 1.2, 'intercept': 3.0}}
+        engine.active_trades = {'Y-X': {'side': 'LONG'}}
+        engine.risk_manager = mock.Mock()
+        engine.risk_manager.check_take_profit.return_value = (True, 'tp')
+        engine.risk_manager.check_stop_loss.return_value = (False, '')
+        engine._close_position = mock.Mock()
+        
+        with mock.patch('builtins.print'):
+            engine._process_orphan_pair('Y-X', engine.orphan_pairs['Y-X'], {'Y': y, 'X': x})
+        
+        self.assertEqual(engine.risk_manager.check_take_profit.call_count, 1)
+        self.assertNotIn('Y-X', engine.orphan_pairs)
+        engine._close_position.assert_called_once()
+
+
+class TestEnginePairPlans(unittest.TestCase):
+    """Test per-pair sizing resolved once at engine construction"""
+    
+    def test_sizing_plan(self):
+        """Beta-neutral lots, mismatch and the >20% reject rule"""
+        from trading_floor.engine import TradingEngine
+        
+        plan = TradingEngine._sizing_plan(1.0, 550, 700)
+        self.assertEqual((plan['lots_y'], plan['lots_x']), (1, 1))
+        self.assertAlmostEqual(plan['mismatch_pct'], 150 / 550 * 100)
+        self.assertEqual((plan['best_lots_y'], plan['best_lots_x']), (1, 1))
+        self.assertTrue(plan['mismatch_reject'])
+        
+        plan = TradingEngine._sizing_plan(0.5, 1000, 500)
+        self.assertEqual(plan['mismatch_pct'], 0)
+        self.assertFalse(plan['mismatch_reject'])
+
+
+class TestEngineCycleClock(unittest.TestCase):
+    """Test the engine loop sleeps to interval boundaries"""
+    
+    def test_seconds_to_next_interval(self):
+        """Sleep ends on the next minute boundary, a full interval when already on one"""
+        from trading_floor.engine import seconds_to_next_interval
+        self.assertAlmostEqual(seconds_to_next_interval(1704166555.5, 60), 4.5)
+        self.assertEqual(seconds_to_next_interval(1704166500.0, 60), 60)
+
+
+class TestSharedPriceTable(unittest.TestCase):
+    """Test engine -> dashboard shared-memory price table"""
+    
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.sidecar = os.path.join(self._tmpdir.name, 'shared_prices.json')
+    
+    def tearDown(self):
+        self._tmpdir.cleanup()
     
-    def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+    def test_reader_sees_writer_prices(self):
+        """An attached reader sees ticked prices; untouched slots are omitted"""
+        from trading_floor.shared_state import SharedPriceTable
+        writer = SharedPriceTable(['HDFCBANK', 'ICICIBANK', 'SBIN'], sidecar_file=self.sidecar)
+        try:
+            reader = SharedPriceTable.attach(self.sidecar)
+            self.assertTrue(reader.is_stale())
+            writer.set_price(writer.slot('SBIN'), 812.5)
+            self.assertFalse(reader.is_stale())
+            self.assertEqual(reader.prices(), {'SBIN': 812.5})
+            reader.close()
+        finally:
+            writer.close()
+        self.assertIsNone(SharedPriceTable.attach(self.sidecar))
+
+
+class TestStatCache(unittest.TestCase):
+    """Test memoized ADF/KPSS keyed by residual content"""
+
+    def setUp(self):
+        import numpy as np
+        from infrastructure.data import stat_cache
+        self.stat_cache = stat_cache
+        stat_cache.cache_clear()
+        self.resid = np.random.default_rng(7).standard_normal(120)
+
+    def test_adf_hit_on_same_content(self):
+        """Equal arrays (even a copy) reuse the cached result"""
+        first = self.stat_cache.adf_memo(self.resid, autolag='AIC')
+        second = self.stat_cache.adf_memo(self.resid.copy(), autolag='AIC')
+        self.assertIs(first, second)
+        self.assertEqual(self.stat_cache.adf_memo.cache_info()['hits'], 1)
+
+    def test_adf_matches_statsmodels(self):
+        """Memoized result equals a direct adfuller call"""
+        from statsmodels.tsa.stattools import adfuller
+        cached = self.stat_cache.adf_memo(self.resid, autolag='AIC')
+        direct = adfuller(self.resid, autolag='AIC')
+        self.assertEqual(cached[0], direct[0])
+        self.assertEqual(cached[1], direct[1])
+
+    def test_params_are_part_of_key(self):
+        """Different test parameters are cached separately"""
+        self.stat_cache.adf_memo(self.resid, maxlag=1, autolag=None)
+        self.stat_cache.adf_memo(self.resid, maxlag=2, autolag=None)
+        self.assertEqual(self.stat_cache.adf_memo.cache_info()['misses'], 2)
 
 
 class TestDataCache(unittest.TestCase):
@@ -97,24 +366,18 @@ class TestDataCache(unittest.TestCase):
     
     def test_parallel_fetch_function(self):
         """Verify parallel_fetch method exists"""
-        source = self._read_file('infrastructure/data/cache.py')
-        self.assertIn('def parallel_fetch', source)
-        self.assertIn('ThreadPoolExecutor', source)
+        path = 'infrastructure/data/cache.py'
+        self.assertIsNotNone(src.find_def(path, 'parallel_fetch', parent='DataCache'))
+        self.assertIn('ThreadPoolExecutor', src.identifiers(path))
     
     def test_incremental_update_function(self):
         """Verify incremental update logic exists"""
-        source = self._read_file('infrastructure/data/cache.py')
-        self.assertIn('_incremental_update', source)
+        self.assertIn('_incremental_update', src.identifiers('infrastructure/data/cache.py'))
     
     def test_thread_safety(self):
         """Verify thread-safe locking is used"""
-        source = self._read_file('infrastructure/data/cache.py')
-        self.assertIn('threading.RLock', source)
-        self.assertIn('with self._lock', source)
-    
-    def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        self.assertTrue(src.calls('infrastructure/data/cache.py', 'threading.RLock'))
+        self.assertIn('self._lock', src.with_items('infrastructure/data/cache.py'))
 
 
 class TestWebSocketTicker(unittest.TestCase):
@@ -126,24 +389,20 @@ class TestWebSocketTicker(unittest.TestCase):
     
     def test_realtime_ticker_class(self):
         """Verify RealtimeTicker class exists"""
-        source = self._read_file('infrastructure/broker/ticker.py')
-        self.assertIn('class RealtimeTicker', source)
+        node = src.find_def('infrastructure/broker/ticker.py', 'RealtimeTicker')
+        self.assertIsInstance(node, ast.ClassDef)
     
     def test_mock_ticker_class(self):
         """Verify MockTicker for testing exists"""
-        source = self._read_file('infrastructure/broker/ticker.py')
-        self.assertIn('class MockTicker', source)
+        node = src.find_def('infrastructure/broker/ticker.py', 'MockTicker')
+        self.assertIsInstance(node, ast.ClassDef)
     
     def test_websocket_callbacks(self):
         """Verify WebSocket callback handlers exist"""
-        source = self._read_file('infrastructure/broker/ticker.py')
-        self.assertIn('on_ticks', source)
-        self.assertIn('on_connect', source)
-        self.assertIn('on_close', source)
-    
-    def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        names = src.identifiers('infrastructure/broker/ticker.py')
+        self.assertIn('on_ticks', names)
+        self.assertIn('on_connect', names)
+        self.assertIn('on_close', names)
 
 
 class TestEngineDependencyInjection(unittest.TestCase):
@@ -151,32 +410,28 @@ class TestEngineDependencyInjection(unittest.TestCase):
     
     def test_factory_function_exists(self):
         """Verify create_engine factory function exists"""
-        source = self._read_file('trading_floor/engine.py')
-        self.assertIn('def create_engine', source)
+        node = src.find_def('trading_floor/engine.py', 'create_engine')
+        self.assertIsInstance(node, ast.FunctionDef)
     
     def test_engine_accepts_dependencies(self):
         """Verify TradingEngine accepts dependencies in constructor"""
-        source = self._read_file('trading_floor/engine.py')
+        init = src.find_def('trading_floor/engine.py', '__init__', parent='TradingEngine')
+        self.assertIsNotNone(init)
         # Check constructor signature has key dependencies
-        self.assertIn('broker,', source)
-        self.assertIn('data_cache,', source)
-        self.assertIn('state_manager,', source)
-        self.assertIn('ticker=None', source)
+        args = [a.arg for a in init.args.args]
+        for dep in ('broker', 'data_cache', 'state_manager', 'ticker'):
+            self.assertIn(dep, args)
+        defaults = dict(zip(args[len(args) - len(init.args.defaults):], init.args.defaults))
+        self.assertIsNone(defaults['ticker'].value)
     
     def test_cli_uses_factory(self):
         """Verify CLI uses create_engine factory"""
-        source = self._read_file('cli.py')
-        self.assertIn('from trading_floor.engine import create_engine', source)
-        self.assertIn('create_engine(', source)
+        self.assertTrue(src.imports_from('cli.py', 'trading_floor.engine', 'create_engine'))
+        self.assertTrue(src.calls('cli.py', 'create_engine'))
     
     def test_websocket_cli_flag(self):
         """Verify CLI has --websocket flag"""
-        source = self._read_file('cli.py')
-        self.assertIn('--websocket', source)
-    
-    def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        self.assertIn('--websocket', src.string_constants('cli.py'))
 
 
 if __name__ == '__main__':
@@ -185,6 +440,12 @@ if __name__ == '__main__':
     
     suite.addTests(loader.loadTestsFromTestCase(TestStateManager))
     suite.addTests(loader.loadTestsFromTestCase(TestGuardianCaching))
+    suite.addTests(loader.loadTestsFromTestCase(TestGuardianRingBuffer))
+    suite.addTests(loader.loadTestsFromTestCase(TestPairStrategyFastPath))
+    suite.addTests(loader.loadTestsFromTestCase(TestEngineSignalPool))
+    suite.addTests(loader.loadTestsFromTestCase(TestEnginePairPlans))
+    suite.addTests(loader.loadTestsFromTestCase(TestEngineCycleClock))
+    suite.addTests(loader.loadTestsFromTestCase(TestSharedPriceTable))
     suite.addTests(loader.loadTestsFromTestCase(TestDataCache))
     suite.addTests(loader.loadTestsFromTestCase(TestWebSocketTicker))
     suite.addTests(loader.loadTestsFromTestCase(TestEngineDependencyInjection))
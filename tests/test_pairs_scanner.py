@@ -11,13 +11,14 @@ import unittest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import _source_index as src
+
 
 class TestPairsScannerOptimizations(unittest.TestCase):
     """Test optimization features"""
     
     def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        return src.source(path)
     
     def test_pairs_cache_class(self):
         """Verify PairsCache class exists"""
@@ -61,9 +62,32 @@ class TestPairsScannerOptimizations(unittest.TestCase):
         self.assertIn('_lock', source)
 
 
+class TestBatchRSquared(unittest.TestCase):
+    """Test sector-wide R² from a single correlation matrix"""
+    
+    def test_matches_linregress(self):
+        """Batch R² equals per-pair linregress; unequal lengths are skipped"""
+        import numpy as np
+        import pandas as pd
+        from scipy import stats
+        from research_lab.scan_pairs import batch_r_squared
+        
+        rng = np.random.default_rng(3)
+        prices = {f"S{i}": pd.Series(np.cumsum(rng.normal(size=120)) + 100) for i in range(4)}
+        prices['SHORT'] = pd.Series(np.cumsum(rng.normal(size=90)) + 100)
+        
+        r2 = batch_r_squared(list(prices), prices)
+        
+        self.assertNotIn(('S0', 'SHORT'), r2)
+        for s1, s2 in [('S0', 'S1'), ('S3', 'S2')]:
+            expected = stats.linregress(prices[s1].values, prices[s2].values).rvalue ** 2
+            self.assertAlmostEqual(r2[(s1, s2)], expected, places=10)
+
+
 if __name__ == '__main__':
     loader = unittest.TestLoader()
     suite = loader.loadTestsFromTestCase(TestPairsScannerOptimizations)
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchRSquared))
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     sys.exit(0 if result.wasSuccessful() else 1)
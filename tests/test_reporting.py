@@ -15,13 +15,16 @@ import json
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import _source_index as src
+import trading_floor.alerts as alerts
+from trading_floor.alerts import AlertManager
+
 
 class TestPairDataReport(unittest.TestCase):
     """Test pair data report module (source inspection to avoid pandas import)."""
     
     def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        return src.source(path)
     
     def test_module_exists(self):
         """Verify module exists with required functions."""
@@ -42,19 +45,16 @@ class TestPairDataReport(unittest.TestCase):
     
     def test_required_output_fields(self):
         """Verify report includes all required fields per Phase 3."""
-        source = self._read_file('reporting/pair_data_report.py')
         required_fields = ['Y_Stock', 'X_Stock', 'Beta', 'Intercept', 
                           'ADF', 'Sigma', 'Z_Score', 'Signal']
-        for field in required_fields:
-            self.assertIn(field, source, f"Missing field: {field}")
+        self.assertEqual(src.missing('reporting/pair_data_report.py', required_fields), set())
 
 
 class TestTradeAnalytics(unittest.TestCase):
     """Test trade analytics module (source inspection)."""
     
     def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        return src.source(path)
     
     def test_module_exists(self):
         """Verify module exists with TradeAnalytics class."""
@@ -65,44 +65,39 @@ class TestTradeAnalytics(unittest.TestCase):
     
     def test_required_metrics(self):
         """Verify all Phase 10 metrics are calculated."""
-        source = self._read_file('reporting/trade_analytics.py')
         # Required metrics per checklist
         required = ['win_rate', 'avg_profit', 'avg_loss', 'profit_factor', 
                    'max_drawdown', 'sharpe']
-        for metric in required:
-            self.assertIn(metric, source.lower(), f"Missing metric: {metric}")
+        self.assertEqual(src.missing('reporting/trade_analytics.py', required, lower=True), set())
     
     def test_pnl_calculation(self):
         """Verify P&L calculation exists."""
-        source = self._read_file('reporting/trade_analytics.py')
-        self.assertIn('net_pnl', source)
-        self.assertIn('gross_profit', source)
-        self.assertIn('gross_loss', source)
+        self.assertEqual(src.missing('reporting/trade_analytics.py',
+                                     ['net_pnl', 'gross_profit', 'gross_loss']), set())
 
 
 class TestAlertManager(unittest.TestCase):
     """Test alert manager module."""
     
-    def setUp(self):
-        """Create temp log file for tests."""
-        self.temp_log = tempfile.mktemp(suffix='.log')
+    @classmethod
+    def setUpClass(cls):
+        """One temp dir for the class; each test logs to its own file in it."""
+        cls._tmpdir = tempfile.TemporaryDirectory()
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmpdir.cleanup()
     
-    def tearDown(self):
-        """Clean up temp file."""
-        if os.path.exists(self.temp_log):
-            os.remove(self.temp_log)
+    def setUp(self):
+        self.temp_log = os.path.join(self._tmpdir.name, f"{self._testMethodName}.log")
     
     def test_alert_manager_creation(self):
         """Test AlertManager initialization."""
-        from trading_floor.alerts import AlertManager
-        
         manager = AlertManager(log_file=self.temp_log, console=False)
-        self.assertEqual(manager.alert_history, [])
+        self.assertEqual(list(manager.alert_history), [])
     
     def test_entry_alert(self):
         """Test entry signal alert."""
-        from trading_floor.alerts import AlertManager
-        
         manager = AlertManager(log_file=self.temp_log, console=False)
         manager.entry_signal("SBIN-HDFCBANK", "LONG_SPREAD", z_score=-2.5)
         
@@ -111,8 +106,6 @@ class TestAlertManager(unittest.TestCase):
     
     def test_stop_loss_alert(self):
         """Test stop loss alert."""
-        from trading_floor.alerts import AlertManager
-        
         manager = AlertManager(log_file=self.temp_log, console=False)
         manager.stop_loss("SBIN-HDFCBANK", z_score=-3.5, threshold=3.0)
         
@@ -121,10 +114,9 @@ class TestAlertManager(unittest.TestCase):
     
     def test_alert_logging(self):
         """Test that alerts are written to log file."""
-        from trading_floor.alerts import AlertManager
-        
         manager = AlertManager(log_file=self.temp_log, console=False)
         manager.entry_signal("TEST", "LONG_SPREAD", z_score=-2.0)
+        manager.flush()
         
         # Check log file exists and has content
         self.assertTrue(os.path.exists(self.temp_log))
@@ -135,10 +127,96 @@ class TestAlertManager(unittest.TestCase):
         self.assertIn("ENTRY", content)
         self.assertIn("TEST", content)
     
+    def test_stop_loss_flushed_immediately(self):
+        """Stop loss alerts reach the log file without an explicit flush."""
+        manager = AlertManager(log_file=self.temp_log, console=False)
+        manager.stop_loss("PAIR", z_score=-3.5)
+        
+        with open(self.temp_log, 'r') as f:
+            self.assertIn("STOP_LOSS", f.read())
+        manager.close()
+    
+    def test_file_log_disabled(self):
+        """With file_log=False alerts stay in memory and no file is created."""
+        manager = AlertManager(log_file=self.temp_log, console=False, file_log=False)
+        manager.stop_loss("PAIR", z_score=-3.5)
+        manager.flush()
+        
+        self.assertEqual(len(manager.alert_history), 1)
+        self.assertFalse(os.path.exists(self.temp_log))
+    
+    def test_background_writer_keeps_order(self):
+        """A burst of alerts is written in order once flushed."""
+        manager = AlertManager(log_file=self.temp_log, console=False)
+        for i in range(500):
+            manager.exit_signal(f"PAIR-{i}", z_score=0.0)
+        manager.flush()
+        
+        with open(self.temp_log, 'r') as f:
+            messages = [json.loads(line)['message'] for line in f]
+        self.assertEqual(messages, [f"EXIT: PAIR-{i} (Mean Reversion)" for i in range(500)])
+        manager.close()
+    
+    def test_steady_stream_flushed_by_age(self):
+        """Alerts arriving faster than FLUSH_INTERVAL still reach disk within ~2 intervals."""
+        import time
+        manager = AlertManager(log_file=self.temp_log, console=False)
+        gap = AlertManager.FLUSH_INTERVAL / 4
+        deadline = time.monotonic() + 2 * AlertManager.FLUSH_INTERVAL + gap
+        lines = 0
+        while time.monotonic() < deadline:
+            manager.exit_signal("A-B", z_score=0.0)
+            time.sleep(gap)
+            if os.path.exists(self.temp_log):
+                with open(self.temp_log, 'r') as f:
+                    lines = len(f.readlines())
+                if lines:
+                    break
+        manager.close()
+        self.assertGreater(lines, 0)
+    
+    def test_caller_data_mutation_not_logged(self):
+        """Mutating the data dict after logging doesn't change the queued record."""
+        manager = AlertManager(log_file=self.temp_log, console=False)
+        data = {"z_score": -2.5}
+        manager._log("ENTRY", "ENTRY: A-B", data)
+        data["z_score"] = 99.0
+        data["extra"] = True
+        manager.flush()
+        
+        with open(self.temp_log, 'r') as f:
+            self.assertEqual(json.loads(f.readline())["data"], {"z_score": -2.5})
+        self.assertEqual(manager.alert_history[0]["data"], {"z_score": -2.5})
+        manager.close()
+    
+    def test_log_line_both_serializers(self):
+        """orjson and stdlib json produce the same compact record."""
+        from unittest import mock
+        import numpy as np
+        record = {"timestamp": "2024-01-02 09:15:00", "level": "ENTRY",
+                  "message": "ENTRY: A-B", "data": {"z_score": np.float64(-2.5)}}
+        
+        lines = []
+        for backend in (alerts.orjson, None):
+            with mock.patch.object(alerts, 'orjson', backend):
+                lines.append(alerts._dumps_line(record))
+        self.assertEqual(lines[0], lines[1])
+        self.assertTrue(lines[0].endswith(b"\n"))
+        self.assertEqual(json.loads(lines[0])["data"]["z_score"], -2.5)
+    
+    def test_cached_timestamp_matches_datetime(self):
+        """Cached timestamp has the datetime.strftime format and value."""
+        from datetime import datetime
+        from unittest import mock
+        
+        with mock.patch.object(alerts.time, 'time', return_value=1704166500.75):
+            first = alerts._timestamp()
+            self.assertIs(alerts._timestamp(), first)
+        expected = datetime.fromtimestamp(1704166500).strftime("%Y-%m-%d %H:%M:%S")
+        self.assertEqual(first, expected)
+    
     def test_alert_summary(self):
         """Test alert summary function."""
-        from trading_floor.alerts import AlertManager
-        
         manager = AlertManager(log_file=self.temp_log, console=False)
         manager.entry_signal("A", "LONG_SPREAD", z_score=-2.0)
         manager.exit_signal("A", z_score=-0.5)
@@ -150,14 +228,108 @@ class TestAlertManager(unittest.TestCase):
         self.assertEqual(summary['by_level']['ENTRY'], 1)
         self.assertEqual(summary['by_level']['EXIT'], 1)
         self.assertEqual(summary['by_level']['STOP_LOSS'], 1)
+    
+    def test_history_bounded(self):
+        """Oldest alerts are dropped and summary counts follow the window."""
+        manager = AlertManager(log_file=self.temp_log, console=False, history_size=3)
+        manager.entry_signal("A", "LONG_SPREAD", z_score=-2.0)
+        manager.entry_signal("B", "LONG_SPREAD", z_score=-2.0)
+        manager.exit_signal("A", z_score=-0.5)
+        manager.exit_signal("B", z_score=-0.5)
+        
+        self.assertEqual(len(manager.alert_history), 3)
+        self.assertEqual(manager.get_recent_alerts(1)[0]['message'], "EXIT: B (Mean Reversion)")
+        summary = manager.summary()
+        self.assertEqual(summary['total'], 3)
+        self.assertEqual(summary['by_level'], {'ENTRY': 1, 'EXIT': 2})
+        self.assertEqual([a['message'] for a in manager.get_alerts_by_level("ENTRY")],
+                         ["ENTRY LONG: B"])
+        self.assertEqual(manager.get_alerts_by_level("STOP_LOSS"), [])
+        manager.close()
+    
+    def test_console_line_format(self):
+        """Console line keeps the icon, timestamp, level, message and data."""
+        import io
+        from contextlib import redirect_stdout
+        
+        manager = AlertManager(log_file=self.temp_log, console=True)
+        out = io.StringIO()
+        with redirect_stdout(out):
+            manager.exit_signal("A-B", z_score=-0.5)
+            manager._log("CUSTOM", "no data")
+        manager.close()
+        
+        ts = manager.alert_history[0]['timestamp']
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], f"✅ [{ts}] EXIT: EXIT: A-B (Mean Reversion) | "
+                                   "{'z_score': -0.5, 'reason': 'Mean Reversion'}")
+        self.assertTrue(lines[1].startswith("• ["))
+        self.assertTrue(lines[1].endswith("] CUSTOM: no data"))
+
+
+class TestDashboardAlerts(unittest.TestCase):
+    """Test per-cycle dashboard signal alerts."""
+    
+    def setUp(self):
+        import trading_floor.dashboard as dashboard
+        self.dashboard = dashboard
+        dashboard._last_signal.clear()
+    
+    def test_one_alert_per_cycle_with_repeats_dropped(self):
+        """Signals go out as one INFO alert; a pair repeating last cycle's signal is skipped."""
+        from unittest import mock
+        signals = [{'pair': 'A-B', 'type': 'ENTRY', 'z_score': -2.61},
+                   {'pair': 'C-D', 'type': 'EXIT', 'z_score': 0.4}]
+        
+        with mock.patch.object(alerts, 'send_alert') as send:
+            self.dashboard._alert_signals(signals)
+            self.dashboard._alert_signals(signals[:1])
+            self.dashboard._alert_signals([])
+            self.dashboard._alert_signals(signals[:1])
+        
+        self.assertEqual(send.call_count, 2)
+        level, msg, data = send.call_args_list[0].args
+        self.assertEqual(level, 'INFO')
+        self.assertEqual(msg, "ENTRY: A-B at Z=-2.61\nEXIT: C-D at Z=0.40")
+        self.assertEqual(data['signals'], signals)
+        self.assertEqual(send.call_args_list[1].args[1], "ENTRY: A-B at Z=-2.61")
+    
+    def test_changed_signal_alerts_and_state_stays_bounded(self):
+        """A pair switching signal type alerts again; only current pairs are remembered."""
+        from unittest import mock
+        with mock.patch.object(alerts, 'send_alert') as send:
+            self.dashboard._alert_signals([{'pair': 'A-B', 'type': 'ENTRY', 'z_score': -2.6}])
+            self.dashboard._alert_signals([{'pair': 'A-B', 'type': 'EXIT', 'z_score': 0.1},
+                                           {'pair': 'E-F', 'type': 'ENTRY', 'z_score': 2.7}])
+            self.dashboard._alert_signals([{'pair': 'E-F', 'type': 'ENTRY', 'z_score': 2.8}])
+        
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(send.call_args_list[1].args[1], "EXIT: A-B at Z=0.10\nENTRY: E-F at Z=2.70")
+        self.assertEqual(self.dashboard._last_signal, {'E-F': 'ENTRY'})
+
+
+class TestDashboardStateWrites(unittest.TestCase):
+    """Test dashboard state snapshots are written atomically on every cycle."""
+    
+    def test_every_snapshot_is_written(self):
+        """Repeated snapshots overwrite the file, so last_updated stays current."""
+        from trading_floor.dashboard import LiveDashboard
+        trackers = {'A-B': {'position': {'is_open': False}}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state.json')
+            for stamp in ('x', 'y'):
+                state = {'trackers': trackers, 'last_updated': stamp}
+                LiveDashboard.write_state(state, path)
+                with open(path) as f:
+                    self.assertEqual(json.load(f), state)
+            self.assertFalse(os.path.exists(path + '.tmp'))
 
 
 class TestCLIReportingCommands(unittest.TestCase):
     """Test CLI has reporting commands."""
     
     def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
+        return src.source(path)
     
     def test_pair_report_command(self):
         """Verify pair-report command exists."""
@@ -186,6 +358,8 @@ if __name__ == '__main__':
     suite.addTests(loader.loadTestsFromTestCase(TestPairDataReport))
     suite.addTests(loader.loadTestsFromTestCase(TestTradeAnalytics))
     suite.addTests(loader.loadTestsFromTestCase(TestAlertManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestDashboardAlerts))
+    suite.addTests(loader.loadTestsFromTestCase(TestDashboardStateWrites))
     suite.addTests(loader.loadTestsFromTestCase(TestCLIReportingCommands))
     
     runner = unittest.TextTestRunner(verbosity=2)
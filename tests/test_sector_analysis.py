@@ -11,55 +11,61 @@ import re
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import _source_index as src
+
+PATH = 'research_lab/sector_analysis.py'
+
 
 class TestSectorAnalysisOptimizations(unittest.TestCase):
     """Test that all optimizations are present"""
     
-    def _read_file(self, path):
-        with open(path, 'r') as f:
-            return f.read()
-    
     def test_parallel_processing(self):
         """Verify ThreadPoolExecutor is used"""
-        source = self._read_file('research_lab/sector_analysis.py')
-        self.assertIn('ThreadPoolExecutor', source)
-        self.assertIn('as_completed', source)
-        self.assertIn('max_workers', source)
+        self.assertEqual(src.missing(PATH, [
+            'ThreadPoolExecutor',
+            'as_completed',
+            'max_workers',
+        ]), set())
     
     def test_cache_class(self):
         """Verify SectorCache class exists"""
-        source = self._read_file('research_lab/sector_analysis.py')
-        self.assertIn('class SectorCache', source)
-        self.assertIn('def get(self', source)
-        self.assertIn('def set(self', source)
+        self.assertEqual(src.missing(PATH, [
+            'class SectorCache',
+            'def get(self',
+            'def set(self',
+        ]), set())
     
     def test_retry_logic(self):
         """Verify retry with exponential backoff"""
-        source = self._read_file('research_lab/sector_analysis.py')
-        self.assertIn('fetch_sector_with_retry', source)
-        self.assertIn('RETRY_ATTEMPTS', source)
-        self.assertIn('2 ** attempt', source)
+        self.assertEqual(src.missing(PATH, [
+            'fetch_sector_with_retry',
+            'RETRY_ATTEMPTS',
+            '2 ** attempt',
+        ]), set())
     
     def test_progress_class(self):
         """Verify SectorProgressManager exists"""
-        source = self._read_file('research_lab/sector_analysis.py')
-        self.assertIn('class SectorProgressManager', source)
-        self.assertIn('def load(self', source)
-        self.assertIn('def save(self', source)
+        self.assertEqual(src.missing(PATH, [
+            'class SectorProgressManager',
+            'def load(self',
+            'def save(self',
+        ]), set())
     
     def test_thread_safety(self):
         """Verify thread-safe locking"""
-        source = self._read_file('research_lab/sector_analysis.py')
-        self.assertIn('threading.Lock', source)
-        self.assertIn('self._lock', source)
+        self.assertEqual(src.missing(PATH, [
+            'threading.Lock',
+            'self._lock',
+        ]), set())
     
     def test_config_constants(self):
         """Verify configuration constants"""
-        source = self._read_file('research_lab/sector_analysis.py')
-        self.assertIn('MAX_WORKERS', source)
-        self.assertIn('RETRY_ATTEMPTS', source)
-        self.assertIn('CACHE_EXPIRY_HOURS', source)
-        self.assertIn('API_DELAY', source)
+        self.assertEqual(src.missing(PATH, [
+            'MAX_WORKERS',
+            'RETRY_ATTEMPTS',
+            'CACHE_EXPIRY_HOURS',
+            'API_DELAY',
+        ]), set())
 
 
 if __name__ == '__main__':
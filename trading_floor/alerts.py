@@ -16,16 +16,55 @@ Supports multiple notification channels:
 
 import os
 import sys
-from datetime import datetime
+import time
+import queue
+import atexit
+import threading
+import weakref
+from collections import Counter, defaultdict, deque
 from typing import Optional, Dict, Any
 import json
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-import infrastructure.config as config
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to stdlib json
+    orjson = None
+
+_ENCODER = json.JSONEncoder(separators=(',', ':'), default=str)
+
+
+def _dumps_line(alert: Dict[str, Any]) -> bytes:
+    """Serialize one alert record to a compact JSON line (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(
+            alert,
+            default=str,
+            option=(orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS |
+                    orjson.OPT_SERIALIZE_NUMPY)
+        )
+    return (_ENCODER.encode(alert) + "\n").encode('utf-8')
+
+
+# Last formatted second: (epoch second, "YYYY-mm-dd HH:MM:SS")
+_ts_cache = (-1, "")
+
+
+def _timestamp() -> str:
+    """Local wall-clock timestamp, reformatted at most once per second."""
+    global _ts_cache
+    sec = int(time.time())
+    cached_sec, cached_str = _ts_cache
+    if sec != cached_sec:
+        cached_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+        _ts_cache = (sec, cached_str)  # single tuple swap - safe across threads
+    return cached_str
 
 
 class AlertLevel:
     """Alert severity levels."""
+    
     INFO = "INFO"
     ENTRY = "ENTRY"
     EXIT = "EXIT"
@@ -34,6 +73,10 @@ class AlertLevel:
     CRITICAL = "CRITICAL"
 
 
+# Writer-thread shutdown sentinel
+_STOP = object()
+
+
 class AlertManager:
     """
     Manages trading alerts and notifications.
@@ -45,6 +88,14 @@ class AlertManager:
         alerts.stop_loss("SBIN-HDFCBANK", z_score=-3.5)
     """
     
+    __slots__ = (
+        'log_file', 'console', 'file_log',
+        'alert_history', '_level_counts', '_by_level',
+        '_queue', '_writer', '_writer_lock',
+        '_fd', '_buf', '_pending', '_last_drain', '_io_lock',
+        '__weakref__',  # for _open_managers
+    )
+    
     # Alert icons
     ICONS = {
         AlertLevel.INFO: "ℹ️",
@@ -55,48 +106,208 @@ class AlertManager:
         AlertLevel.CRITICAL: "🔴",
     }
     
-    def __init__(self, log_file: Optional[str] = None, console: bool = True):
+    # Console line pieces per level: head + timestamp + tail + message
+    _PREFIX = {level: (f"{icon} [", f"] {level}: ") for level, icon in ICONS.items()}
+    
+    # Log file buffering: flush once this many records are pending or the
+    # last flush is this many seconds old (even under a steady stream of
+    # alerts), and immediately for levels that must survive a crash
+    FLUSH_EVERY = 64
+    FLUSH_INTERVAL = 1.0
+    FLUSH_LEVELS = (AlertLevel.STOP_LOSS, AlertLevel.CRITICAL)
+    
+    # Background writer: queue bound and max records per write
+    QUEUE_SIZE = 10000
+    WRITE_BATCH = 128
+    
+    def __init__(self, log_file: Optional[str] = None, console: bool = True,
+                 history_size: int = 10000, file_log: bool = True):
         """
         Initialize AlertManager.
         
         Args:
             log_file: Optional path to alert log file
             console: Whether to print alerts to console
+            history_size: Max alerts kept in memory (oldest dropped first)
+            file_log: Whether to append alerts to log_file (False keeps
+                history only, e.g. for backtests)
         """
-        self.log_file = log_file or os.path.join(config.LOG_DIR, "alerts.log")
+        if log_file is None:
+            import infrastructure.config as config  # Only needed for the default path
+            log_file = os.path.join(config.LOG_DIR, "alerts.log")
+        self.log_file = log_file
         self.console = console
-        self.alert_history = []
+        self.file_log = file_log
+        self.alert_history = deque(maxlen=history_size)
+        self._level_counts = Counter()  # Per-level counts of alert_history
+        self._by_level = defaultdict(deque)  # Per-level views of alert_history
+        
+        # File logging runs on a background writer thread: callers only
+        # enqueue. The thread starts on demand and retires when idle.
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        
+        # Raw O_APPEND log fd (opened on first flush) and pending JSON lines
+        self._fd: Optional[int] = None
+        self._buf = bytearray()
+        self._pending = 0
+        self._last_drain = time.monotonic()
+        self._io_lock = threading.Lock()
+        _open_managers.add(self)
         
         # Ensure log directory exists
-        os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        if file_log:
+            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
     
     def _log(self, level: str, message: str, data: Optional[Dict] = None):
         """Internal logging function."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        icon = self.ICONS.get(level, "•")
+        timestamp = _timestamp()
         
-        # Build alert record
+        # Build alert record (data copied: the writer thread serializes it
+        # later, after the caller may have reused or mutated its dict)
         alert = {
             "timestamp": timestamp,
             "level": level,
             "message": message,
-            "data": data or {}
+            "data": dict(data) if data else {}
         }
-        self.alert_history.append(alert)
+        history = self.alert_history
+        if len(history) == history.maxlen:
+            # The evicted alert is always the oldest of its level
+            evicted = history[0]['level']
+            self._level_counts[evicted] -= 1
+            self._by_level[evicted].popleft()
+        history.append(alert)
+        self._level_counts[level] += 1
+        self._by_level[level].append(alert)
         
         # Console output
         if self.console:
-            data_str = f" | {data}" if data else ""
-            print(f"{icon} [{timestamp}] {level}: {message}{data_str}")
+            prefix = self._PREFIX.get(level)
+            if prefix is None:
+                prefix = ("• [", f"] {level}: ")
+            data_str = f" | {data}\n" if data else "\n"
+            sys.stdout.write(prefix[0] + timestamp + prefix[1] + message + data_str)
         
-        # File logging
+        # File logging (serialized and written by the writer thread)
+        if not self.file_log:
+            return
         try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(alert) + "\n")
+            self._enqueue(alert)
+        except queue.Full:
+            # Writer can't keep up - write inline rather than drop the alert
+            self._write_batch([alert])
+        
+        if level in self.FLUSH_LEVELS:
+            self.flush()
+    
+    def _enqueue(self, alert: Dict):
+        """Hand an alert to the writer thread, starting it if needed."""
+        # Same lock the writer takes before retiring, so an alert can never
+        # be queued behind a thread that has already decided to exit
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="alert-writer", daemon=True
+                )
+                self._writer.start()
+            self._queue.put_nowait(alert)
+    
+    def _writer_loop(self):
+        """Drain the queue in batches; retire after FLUSH_INTERVAL idle."""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                self._flush_file()
+                with self._writer_lock:
+                    if self._queue.empty():
+                        self._writer = None
+                        return
+                continue
+            
+            batch = [item]
+            while len(batch) < self.WRITE_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            alerts = [a for a in batch if a is not _STOP]
+            if alerts:
+                self._write_batch(alerts)
+            for _ in batch:
+                self._queue.task_done()
+            
+            if len(alerts) < len(batch):
+                self._flush_file()
+                with self._writer_lock:
+                    if self._queue.empty():
+                        self._writer = None
+                        return
+    
+    def _write_batch(self, alerts: list):
+        """Serialize alerts and add them to the pending write buffer."""
+        lines = []
+        for alert in alerts:
+            try:
+                lines.append(_dumps_line(alert))
+            except Exception as e:
+                if self.console:
+                    print(f"⚠️ Failed to write alert log: {e}")
+        if not lines:
+            return
+        
+        with self._io_lock:
+            self._buf += b"".join(lines)
+            self._pending += len(lines)
+            if (self._pending >= self.FLUSH_EVERY
+                    or time.monotonic() - self._last_drain >= self.FLUSH_INTERVAL):
+                self._drain()
+    
+    def _drain(self):
+        """Append the pending buffer with one os.write. Caller holds _io_lock."""
+        self._pending = 0
+        self._last_drain = time.monotonic()
+        if not self._buf:
+            return
+        data = bytes(self._buf)
+        self._buf.clear()
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.log_file, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
         except Exception as e:
             if self.console:
                 print(f"⚠️ Failed to write alert log: {e}")
     
+    def _flush_file(self):
+        with self._io_lock:
+            self._drain()
+    
+    def flush(self):
+        """Wait for queued alerts to be written, then flush the log file."""
+        self._queue.join()
+        self._flush_file()
+    
+    def close(self):
+        """Stop the writer, then flush and close the log file (reopened on next alert)."""
+        with self._writer_lock:
+            writer = self._writer
+            if writer is not None:
+                self._queue.put(_STOP)
+        if writer is not None:
+            writer.join()
+        
+        with self._io_lock:
+            self._drain()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+    
     # === Entry Alerts ===
     
     def entry_signal(self, pair_key: str, signal: str, z_score: float, 
@@ -185,24 +396,35 @@ class AlertManager:
     
     def get_recent_alerts(self, count: int = 10) -> list:
         """Get most recent alerts."""
-        return self.alert_history[-count:]
+        return list(self.alert_history)[-count:]
     
     def get_alerts_by_level(self, level: str) -> list:
         """Get alerts filtered by level."""
-        return [a for a in self.alert_history if a['level'] == level]
+        by_level = self._by_level.get(level)
+        return list(by_level) if by_level else []
     
     def summary(self) -> Dict:
         """Get alert summary statistics."""
-        counts = {}
-        for alert in self.alert_history:
-            level = alert['level']
-            counts[level] = counts.get(level, 0) + 1
+        self.flush()
         return {
             "total": len(self.alert_history),
-            "by_level": counts
+            "by_level": {level: n for level, n in self._level_counts.items() if n}
         }
 
 
+# Live managers, flushed at interpreter exit (weak refs - no leak)
+_open_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for manager in list(_open_managers):
+        try:
+            manager.close()
+        except Exception:
+            pass
+
+
 # Global alert manager instance
 _alert_manager: Optional[AlertManager] = None
 
@@ -217,7 +439,9 @@ def get_alert_manager() -> AlertManager:
 
 def send_alert(level: str, message: str, data: Optional[Dict] = None):
     """Convenience function to send an alert."""
-    manager = get_alert_manager()
+    manager = _alert_manager
+    if manager is None:
+        manager = get_alert_manager()
     manager._log(level, message, data)
 
 
@@ -15,9 +15,11 @@ import os
 import sys
 import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
-from tabulate import tabulate
+import numpy as np
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -25,6 +27,26 @@ import infrastructure.config as config
 from trading_floor.position_tracker import PositionTracker, PairConfig
 
 
+def _canonicalize(pair: dict) -> dict:
+    """
+    Map a pairs-file entry (scanner or legacy field names) to PairConfig fields.
+    
+    Lot sizes are None when the entry doesn't carry them.
+    """
+    return {
+        'stock_y': pair.get('leg1') or pair.get('stock_y'),
+        'stock_x': pair.get('leg2') or pair.get('stock_x'),
+        'sector': pair.get('sector', 'UNKNOWN'),
+        'beta': pair.get('beta') or pair.get('hedge_ratio', 1.0),
+        'intercept': pair.get('intercept', 0.0),
+        # Sigma has gone by several names across scanner versions
+        'sigma': pair.get('sigma', 0) or pair.get('std_err', 0) or pair.get('residual_std_dev', 0),
+        'lot_size_y': pair.get('lot_size_y'),
+        'lot_size_x': pair.get('lot_size_x'),
+        'adf_value': pair.get('adf_pvalue') or pair.get('adf', 0.0),
+    }
+
+
 class LiveDashboard:
     """
     Live trading dashboard with Varsity-style position tracking.
@@ -41,8 +63,18 @@ class LiveDashboard:
         self.trackers: Dict[str, PositionTracker] = {}
         self.active_positions: Dict[str, dict] = {}
         self.trade_history: List[dict] = []
+        
+        # Last prices pushed by the WebSocket ticker (symbol -> price)
+        self._price_cache: Dict[str, float] = {}
+        self._token_symbols: Dict[int, str] = {}
+        self._price_lock = threading.Lock()
+        
+        # Lines last drawn on the terminal (for delta redraws)
+        self._screen: Optional[List[str]] = None
+        
         self._load_pairs_config()
         self._load_active_trades()
+        self._build_pair_arrays()
     
     def _load_pairs_config(self):
         """Load pair configurations from JSON."""
@@ -62,26 +94,14 @@ class LiveDashboard:
         from infrastructure.data.futures_utils import get_lot_size
         
         for p in pairs[:10]:  # Limit to top 10 pairs
-            stock_y = p.get('leg1') or p.get('stock_y')
-            stock_x = p.get('leg2') or p.get('stock_x')
-            pair_key = f"{stock_y}-{stock_x}"
-            
-            # Get sigma - try multiple field names
-            sigma = p.get('sigma', 0) or p.get('std_err', 0) or p.get('residual_std_dev', 0)
-            
-            pair_config = PairConfig(
-                stock_y=stock_y,
-                stock_x=stock_x,
-                sector=p.get('sector', 'UNKNOWN'),
-                beta=p.get('beta') or p.get('hedge_ratio', 1.0),
-                intercept=p.get('intercept', 0.0),
-                sigma=sigma,
-                lot_size_y=p.get('lot_size_y', get_lot_size(stock_y)),
-                lot_size_x=p.get('lot_size_x', get_lot_size(stock_x)),
-                adf_value=p.get('adf_pvalue') or p.get('adf', 0.0)
-            )
+            fields = _canonicalize(p)
+            if fields['lot_size_y'] is None:
+                fields['lot_size_y'] = get_lot_size(fields['stock_y'])
+            if fields['lot_size_x'] is None:
+                fields['lot_size_x'] = get_lot_size(fields['stock_x'])
             
-            self.trackers[pair_key] = PositionTracker(pair_config)
+            pair_config = PairConfig(**fields)
+            self.trackers[f"{pair_config.stock_y}-{pair_config.stock_x}"] = PositionTracker(pair_config)
     
     def _load_active_trades(self):
         """Load any existing active trades from state."""
@@ -110,33 +130,112 @@ class LiveDashboard:
             except Exception as e:
                 print(f"   ⚠️ Failed to load state: {e}")
     
+    def track_tokens(self, token_map: Dict[str, int]) -> List[int]:
+        """
+        Register instrument tokens for WebSocket ticks.
+        
+        Args:
+            token_map: Dict of symbol -> instrument token
+            
+        Returns:
+            Token list to subscribe
+        """
+        with self._price_lock:
+            self._token_symbols = {token: sym for sym, token in token_map.items()}
+        return list(self._token_symbols)
+    
+    def cache_tick(self, token: int, price: float, timestamp=None):
+        """Ticker callback: store the latest price for a tracked token."""
+        symbol = self._token_symbols.get(token)
+        if symbol is None or not price or price <= 0:
+            return
+        with self._price_lock:
+            self._price_cache[symbol] = price
+    
+    def cached_prices(self) -> Dict[str, float]:
+        """Copy of the latest ticked prices (symbol -> price)."""
+        with self._price_lock:
+            return dict(self._price_cache)
+    
+    def _build_pair_arrays(self):
+        """Pair parameters as arrays (one slot per tracker) for vectorized z-scores."""
+        trackers = list(self.trackers.values())
+        self._pair_keys = list(self.trackers)
+        self._tracker_list = trackers
+        self._sym_y = [t.config.stock_y for t in trackers]
+        self._sym_x = [t.config.stock_x for t in trackers]
+        # Unique leg symbols in a stable order, and their REST LTP keys
+        self._all_symbols = tuple(sorted(set(self._sym_y) | set(self._sym_x)))
+        self._nse_keys = [f"NSE:{s}" for s in self._all_symbols]
+        self._beta = np.array([t.config.beta for t in trackers], dtype=np.float64)
+        self._intercept = np.array([t.config.intercept for t in trackers], dtype=np.float64)
+        self._sigma = np.array([t.config.sigma for t in trackers], dtype=np.float64)
+        self._build_row_formats()
+    
+    def _build_row_formats(self):
+        """Fixed-width table templates (pair column sized to the longest pair key)."""
+        w = max([4] + [len(k) for k in self._pair_keys])
+        
+        def table(cols, row_fmt):
+            head = '  '.join(f"{name:{align}{width}}" for name, align, width in cols)
+            rule = '  '.join('-' * width for _, _, width in cols)
+            return head.rstrip() + '\n' + rule, row_fmt
+        
+        self._pos_head, self._pos_fmt = table(
+            [('Pair', '<', w), ('Side', '<', 5), ('Entry Z', '>', 7), ('Curr Z', '>', 7),
+             ('Entry Y', '>', 7), ('Curr Y', '>', 7), ('P&L Y', '>', 8), ('P&L X', '>', 8),
+             ('Total P&L', '>', 9)],
+            f"{{:<{w}}}  {{:<5}}  {{:>7.2f}}  {{:>7.2f}}  {{:>7.0f}}  {{:>7.0f}}  "
+            "{:>+8,.0f}  {:>+8,.0f}  {:>+9,.0f}")
+        self._mon_head, self._mon_fmt = table(
+            [('Pair', '<', w), ('Z-Score', '>', 7), ('Status', '<', 9), ('Sigma', '>', 6),
+             ('Beta', '>', 6), ('Sector', '<', 6)],
+            f"{{:<{w}}}  {{:>+7.3f}}  {{:<9}}  {{:>6.1f}}  {{:>6.3f}}  {{}}")
+    
     def update_prices(self, price_data: Dict[str, float]):
         """
         Update all trackers with latest prices.
         
+        Z-scores and entry checks are computed for all pairs at once;
+        only pairs with valid prices go through their tracker.
+        
         Args:
             price_data: Dict of symbol -> current price
         """
         signals = []
+        if len(self._tracker_list) != len(self.trackers):
+            self._build_pair_arrays()
+        if not self._tracker_list:
+            return signals
         
-        for pair_key, tracker in self.trackers.items():
-            price_y = price_data.get(tracker.config.stock_y, 0)
-            price_x = price_data.get(tracker.config.stock_x, 0)
-            
-            if price_y <= 0 or price_x <= 0:
-                continue
+        py = np.array([price_data.get(s, 0) for s in self._sym_y], dtype=np.float64)
+        px = np.array([price_data.get(s, 0) for s in self._sym_x], dtype=np.float64)
+        valid = (py > 0) & (px > 0)
+        
+        # Same formula as PositionTracker.calculate_z_score (0 when sigma <= 0)
+        sigma_ok = self._sigma > 0
+        z = np.zeros_like(py)
+        np.divide(py - (self._beta * px + self._intercept), self._sigma, out=z, where=sigma_ok)
+        
+        entry = PositionTracker.ENTRY_THRESHOLD
+        enter_long = valid & (z < -entry)
+        enter_short = valid & (z > entry)
+        
+        py_list, px_list = py.tolist(), px.tolist()
+        for i in np.flatnonzero(valid).tolist():
+            tracker = self._tracker_list[i]
+            price_y, price_x = py_list[i], px_list[i]
             
             # Update tracker
             result = tracker.update(price_y, price_x)
             
             # Check for signals
             if not tracker.position.is_open:
-                should_enter, pos_type = tracker.check_entry_signal(price_y, price_x)
-                if should_enter:
+                if enter_long[i] or enter_short[i]:
                     signals.append({
-                        'pair': pair_key,
+                        'pair': self._pair_keys[i],
                         'type': 'ENTRY',
-                        'direction': pos_type,
+                        'direction': 'LONG' if enter_long[i] else 'SHORT',
                         'z_score': result['z_score'],
                         'price_y': price_y,
                         'price_x': price_x
@@ -144,7 +243,7 @@ class LiveDashboard:
             else:
                 if result['should_exit']:
                     signals.append({
-                        'pair': pair_key,
+                        'pair': self._pair_keys[i],
                         'type': 'EXIT',
                         'reason': result['exit_reason'],
                         'z_score': result['z_score'],
@@ -154,12 +253,40 @@ class LiveDashboard:
         return signals
     
     def display(self, clear_screen: bool = True):
-        """Display the live dashboard."""
-        if clear_screen:
+        """
+        Display the live dashboard.
+        
+        On a POSIX terminal the first call clears the screen and later calls
+        rewrite only the lines that changed (ANSI cursor moves), so
+        per-tick refreshes don't repaint everything.
+        """
+        lines = self.render().split('\n')
+        
+        if clear_screen and os.name == 'posix' and sys.stdout.isatty():
+            prev = self._screen
+            if prev is None or len(prev) != len(lines):
+                # Layout changed: home + clear, then full draw
+                sys.stdout.write("\x1b[H\x1b[2J" + '\n'.join(lines) + '\n')
+            else:
+                changed = [f"\x1b[{i + 1};1H{line}\x1b[K"
+                           for i, (line, old) in enumerate(zip(lines, prev)) if line != old]
+                sys.stdout.write(''.join(changed) + f"\x1b[{len(lines) + 1};1H")
+            sys.stdout.flush()
+            self._screen = lines
+            return
+        
+        if clear_screen and os.name != 'posix':
             try:
-                os.system('clear' if os.name == 'posix' else 'cls')
+                os.system('cls')
             except:
                 print("\n" * 3)  # Fallback: just add blank lines
+        self._screen = None
+        print('\n'.join(lines))
+    
+    def render(self) -> str:
+        """Dashboard text for one refresh."""
+        if len(self._tracker_list) != len(self.trackers):
+            self._build_pair_arrays()
         
         output = []
         output.append("")
@@ -168,8 +295,9 @@ class LiveDashboard:
         output.append("=" * 80)
         
         # Capital Summary
-        total_pnl = sum(t.position.total_pnl for t in self.trackers.values() if t.position.is_open)
-        open_count = sum(1 for t in self.trackers.values() if t.position.is_open)
+        open_positions = [(k, t.position) for k, t in self.trackers.items() if t.position.is_open]
+        total_pnl = sum(pos.total_pnl for _, pos in open_positions)
+        open_count = len(open_positions)
         output.append(f"\n💰 Capital: ₹{self.capital:,.0f} | Open Positions: {open_count} | Unrealized P&L: ₹{total_pnl:+,.0f}")
         
         # Active Positions Table
@@ -177,35 +305,22 @@ class LiveDashboard:
             output.append("\n" + "-" * 80)
             output.append("📈 ACTIVE POSITIONS")
             output.append("-" * 80)
+            output.append(self._pos_head)
             
-            headers = ['Pair', 'Side', 'Entry Z', 'Curr Z', 'Entry Y', 'Curr Y', 'P&L Y', 'P&L X', 'Total P&L']
-            data = []
-            
-            for pair_key, tracker in self.trackers.items():
-                if tracker.position.is_open:
-                    pos = tracker.position
-                    data.append([
-                        pair_key,
-                        pos.position_type,
-                        f'{pos.entry_z_score:.2f}',
-                        f'{pos.current_z_score:.2f}',
-                        f'{pos.entry_price_y:.0f}',
-                        f'{pos.current_price_y:.0f}',
-                        f'{pos.pnl_y:+,.0f}',
-                        f'{pos.pnl_x:+,.0f}',
-                        f'{pos.total_pnl:+,.0f}'
-                    ])
-            
-            output.append(tabulate(data, headers=headers, tablefmt='simple'))
+            fmt = self._pos_fmt.format
+            output.extend(
+                fmt(pair_key, pos.position_type, pos.entry_z_score, pos.current_z_score,
+                    pos.entry_price_y, pos.current_price_y, pos.pnl_y, pos.pnl_x, pos.total_pnl)
+                for pair_key, pos in open_positions
+            )
         
         # Z-Score Monitor for All Pairs
         output.append("\n" + "-" * 80)
         output.append("📊 Z-SCORE MONITOR (All Pairs)")
         output.append("-" * 80)
+        output.append(self._mon_head)
         
-        headers = ['Pair', 'Z-Score', 'Status', 'Sigma', 'Beta', 'Sector']
-        data = []
-        
+        fmt = self._mon_fmt.format
         for pair_key, tracker in self.trackers.items():
             z = tracker.position.current_z_score if tracker.position.is_open else 0
             if tracker.logs:
@@ -225,16 +340,8 @@ class LiveDashboard:
             if tracker.position.is_open:
                 status = f"📍 {tracker.position.position_type}"
             
-            data.append([
-                pair_key,
-                f'{z:+.3f}',
-                status,
-                f'{tracker.config.sigma:.1f}',
-                f'{tracker.config.beta:.3f}',
-                tracker.config.sector
-            ])
-        
-        output.append(tabulate(data, headers=headers, tablefmt='simple'))
+            output.append(fmt(pair_key, z, status, tracker.config.sigma,
+                              tracker.config.beta, tracker.config.sector))
         
         # Instructions
         output.append("\n" + "-" * 80)
@@ -246,7 +353,7 @@ class LiveDashboard:
         output.append("   🔴 STOP:   Z expands to ±3.0 → Stop Loss")
         
         output.append("")
-        print('\n'.join(output))
+        return '\n'.join(output)
     
     def run_demo(self, prices: Dict[str, float] = None):
         """Run a demo update with sample/live prices."""
@@ -269,22 +376,101 @@ class LiveDashboard:
                 else:
                     print(f"   🚪 {s['pair']}: EXIT ({s['reason']}) at Z={s['z_score']:.2f}, P&L: ₹{s['pnl']:+,.0f}")
     
-    def save_state(self):
-        """Save dashboard state."""
-        state_file = os.path.join(config.DATA_DIR, "dashboard_state.json")
-        state = {
+    def state_snapshot(self) -> dict:
+        """Capture current tracker state (cheap; safe to write from another thread)."""
+        return {
             'trackers': {k: v.to_dict() for k, v in self.trackers.items()},
             'last_updated': datetime.now().isoformat()
         }
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+    
+    @staticmethod
+    def write_state(state: dict, state_file: Optional[str] = None):
+        """Write a state snapshot to disk atomically."""
+        from trading_floor.state import dumps_json, write_atomic
+        
+        state_file = state_file or os.path.join(config.DATA_DIR, "dashboard_state.json")
+        write_atomic(state_file, dumps_json(state))
+    
+    def save_state(self):
+        """Save dashboard state."""
+        self.write_state(self.state_snapshot())
+
+
+# Signal type each pair raised last cycle. A pair still showing the same
+# signal is not re-alerted; only pairs signalling this cycle are kept.
+_last_signal: Dict[str, str] = {}
 
 
-def run_live_dashboard():
-    """Run the live dashboard with data from broker."""
+def _alert_signals(signals: List[dict]):
+    """Send one alert for a cycle's signals, skipping pairs unchanged since last cycle."""
+    global _last_signal
+    current = {s['pair']: s['type'] for s in signals}
+    fresh = [s for s in signals if _last_signal.get(s['pair']) != s['type']]
+    _last_signal = current
+    if not fresh:
+        return
+    
+    from trading_floor.alerts import send_alert
+    msg = '\n'.join(f"{s['type']}: {s['pair']} at Z={s['z_score']:.2f}" for s in fresh)
+    send_alert('INFO', msg, {'signals': fresh})
+
+
+def _publish_cycle(signals: List[dict], state: dict):
+    """Send signal alerts and persist state (runs on the dashboard I/O thread)."""
+    if signals:
+        try:
+            _alert_signals(signals)
+        except Exception as e:
+            print(f"⚠️ Dashboard alert failed: {e}")
+    try:
+        LiveDashboard.write_state(state)
+    except Exception as e:
+        print(f"⚠️ Dashboard state write failed: {e}")
+
+
+def _start_ticker(broker, dashboard: LiveDashboard):
+    """
+    Subscribe the dashboard's symbols on the Kite WebSocket.
+    
+    Returns:
+        Connected RealtimeTicker, or None if it can't be started
+    """
+    from infrastructure.broker.ticker import RealtimeTicker
+    from infrastructure.data.futures_utils import get_nse_tokens
+    
+    try:
+        token_map = get_nse_tokens(broker, dashboard._all_symbols)
+    except Exception as e:
+        print(f"⚠️ Instrument fetch failed, using REST LTP: {e}")
+        return None
+    
+    tokens = dashboard.track_tokens(token_map)
+    
+    ticker = RealtimeTicker(config.API_KEY, broker.access_token)
+    if not ticker.connect(tokens, on_price_update=dashboard.cache_tick):
+        return None
+    return ticker
+
+
+def run_live_dashboard(use_websocket: bool = False):
+    """
+    Run the live dashboard with data from broker.
+    
+    Args:
+        use_websocket: Read prices from the Kite WebSocket tick cache instead
+            of a REST LTP call per cycle (REST is still used until every
+            symbol has ticked, or if the socket drops)
+    
+    Without our own socket, prices come from the engine's shared price
+    table while the engine is running and ticking.
+    """
     print("\n🚀 Starting Live Dashboard...")
     
+    io_pool = None
+    ticker = None
+    shared = None
     try:
+        from trading_floor.shared_state import SharedPriceTable
         from infrastructure.broker.kite_auth import get_kite
         from infrastructure.data.cache import DataCache
         
@@ -298,38 +484,49 @@ def run_live_dashboard():
         
         print(f"✅ Monitoring {len(dashboard.trackers)} pairs...")
         
+        if use_websocket:
+            ticker = _start_ticker(broker, dashboard)
+        
+        # Alerts and state writes go to one background thread so the
+        # loop isn't held up by disk/alert I/O (single worker keeps order)
+        io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-io")
+        
         while True:
-            # Fetch latest prices
-            symbols = set()
-            for tracker in dashboard.trackers.values():
-                symbols.add(tracker.config.stock_y)
-                symbols.add(tracker.config.stock_x)
-            
-            # Get current LTPs
+            # Prefer WebSocket prices once every symbol has ticked
             price_data = {}
-            try:
-                ltps = broker.ltp([f"NSE:{s}" for s in symbols])
-                for key, val in ltps.items():
-                    symbol = key.replace("NSE:", "")
-                    price_data[symbol] = val.get('last_price', 0)
-            except Exception as e:
-                print(f"⚠️ LTP fetch failed: {e}")
-                time.sleep(10)
-                continue
+            if ticker is not None and ticker.is_connected():
+                price_data = dashboard.cached_prices()
+            else:
+                # Engine's shared price table (re-attach if the engine restarted)
+                if shared is not None and shared.is_stale():
+                    shared.close()
+                    shared = None
+                if shared is None:
+                    shared = SharedPriceTable.attach()
+                if shared is not None and not shared.is_stale():
+                    shared_prices = shared.prices()
+                    price_data = {s: shared_prices[s] for s in dashboard._all_symbols
+                                  if s in shared_prices}
+            
+            # Otherwise get current LTPs over REST
+            if len(price_data) < len(dashboard._all_symbols):
+                price_data = {}
+                try:
+                    ltps = broker.ltp(dashboard._nse_keys)
+                    for key, val in ltps.items():
+                        symbol = key.replace("NSE:", "")
+                        price_data[symbol] = val.get('last_price', 0)
+                except Exception as e:
+                    print(f"⚠️ LTP fetch failed: {e}")
+                    time.sleep(10)
+                    continue
             
             # Update dashboard
             signals = dashboard.update_prices(price_data)
             dashboard.display()
             
-            # Alert on signals
-            if signals:
-                from trading_floor.alerts import send_alert
-                for s in signals:
-                    msg = f"{s['type']}: {s['pair']} at Z={s['z_score']:.2f}"
-                    send_alert(msg, level='INFO')
-            
-            # Save state periodically
-            dashboard.save_state()
+            # Alert on signals and save state (snapshot taken here, written async)
+            io_pool.submit(_publish_cycle, signals, dashboard.state_snapshot())
             
             time.sleep(60)  # Update every minute
             
@@ -339,6 +536,13 @@ def run_live_dashboard():
         print(f"❌ Dashboard error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if ticker is not None:
+            ticker.stop()
+        if shared is not None:
+            shared.close()
+        if io_pool is not None:
+            io_pool.shutdown(wait=True)
 
 
 def run_paper_dashboard():
@@ -354,7 +558,8 @@ def run_paper_dashboard():
     
     import pandas as pd
     
-    # Load historical data for ALL pairs
+    # Load historical data for ALL pairs (only the close column; each
+    # symbol once even if it appears in several pairs)
     historical_data = {}
     for pair_key, tracker in dashboard.trackers.items():
         spot_y_file = os.path.join(config.DATA_DIR, f"{tracker.config.stock_y}_day.csv")
@@ -362,10 +567,14 @@ def run_paper_dashboard():
         
         if os.path.exists(spot_y_file) and os.path.exists(spot_x_file):
             try:
-                df_y = pd.read_csv(spot_y_file)
-                df_x = pd.read_csv(spot_x_file)
-                historical_data[tracker.config.stock_y] = df_y['close'].values
-                historical_data[tracker.config.stock_x] = df_x['close'].values
+                loaded = {}
+                for symbol, path in ((tracker.config.stock_y, spot_y_file),
+                                     (tracker.config.stock_x, spot_x_file)):
+                    if symbol not in historical_data:
+                        loaded[symbol] = pd.read_csv(
+                            path, usecols=['close'], dtype={'close': np.float64}, engine='c'
+                        )['close'].values
+                historical_data.update(loaded)
             except Exception as e:
                 print(f"   ⚠️ Failed to load data for {pair_key}: {e}")
     
@@ -415,9 +624,11 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Live Trading Dashboard")
     parser.add_argument('--mode', choices=['live', 'paper'], default='paper',
                        help='Dashboard mode: live (real broker) or paper (historical)')
+    parser.add_argument('--websocket', action='store_true',
+                       help='Live mode: stream prices over the Kite WebSocket')
     args = parser.parse_args()
     
     if args.mode == 'live':
-        run_live_dashboard()
+        run_live_dashboard(use_websocket=args.websocket)
     else:
         run_paper_dashboard()
@@ -12,6 +12,7 @@ Implements all 6 optimizations:
 
 import time
 import json
+import math
 import os
 import sys
 import pandas as pd
@@ -26,6 +27,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import infrastructure.config as config
 from strategies.pairs import PairStrategy
 
+# Shared stand-in for symbols missing from a fetch (read-only)
+_EMPTY_SERIES = pd.Series(dtype=np.float64)
+
 # --- ⚙️ ENGINE CONFIGURATION ---
 # "NRML" = Futures Overnight (Required per Futures Trading.pdf)
 PRODUCT_TYPE = "NRML"
@@ -35,6 +39,9 @@ TOTAL_CAPITAL = 500000
 
 # Processing settings
 MAX_PARALLEL_WORKERS = 5
+# Free-threaded CPython (3.13t+) can run per-pair strategy math on threads;
+# with the GIL it stays on the main thread
+FREE_THREADED = not getattr(sys, '_is_gil_enabled', lambda: True)()
 PROCESS_INTERVAL_SEC = 60
 MAX_HOLDING_SESSIONS = 25  # Checklist Phase 8: Time-based exit at 25 trading sessions
 
@@ -57,6 +64,16 @@ VERBOSE = False  # Set to True for detailed per-pair logging
 COMPACT_MODE = True  # Show compact table summary instead of scrolling output
 
 
+def seconds_to_next_interval(now: float, interval: float) -> float:
+    """
+    Seconds from `now` (epoch) to the next multiple of `interval`.
+    
+    Epoch minutes line up with IST minutes, so a 60s interval wakes on
+    each market-minute boundary instead of drifting by the cycle time.
+    """
+    return (now // interval + 1) * interval - now
+
+
 class TradingEngine:
     """
     Optimized Trading Engine with Dependency Injection.
@@ -98,6 +115,10 @@ class TradingEngine:
         self.risk_manager = risk_manager
         self.ticker = ticker
         
+        # Shared-memory price table fed by WebSocket ticks (read by the dashboard)
+        self.price_table = None
+        self._token_slots: Dict[int, int] = {}
+        
         print(f"\n--- 🚀 STAT ARB ENGINE v2.0 ({self.mode}) ---")
         print(f"   ⚙️ Product Type: {PRODUCT_TYPE}")
         print(f"   💰 Capital Base: ₹{TOTAL_CAPITAL:,}")
@@ -136,6 +157,10 @@ class TradingEngine:
                 intercept=p.get('intercept', 0.0)
             )
         
+        # Per-pair constants (symbols, strategy, config stats, lot sizing),
+        # resolved once here instead of on every cycle
+        self._pair_plans = [self._build_pair_plan(p) for p in self.pairs_config]
+        
         # Create temporary strategies for orphan positions (so they can exit)
         for pair_key, orphan_data in self.orphan_pairs.items():
             print(f"   👻 Orphan Trade: {pair_key:<20} (monitoring for exit)")
@@ -201,33 +226,26 @@ class TradingEngine:
         return orphans
     
     def _load_instrument_tokens(self) -> Dict[str, int]:
-        """Cache instrument tokens from broker."""
+        """Cache instrument tokens from broker (daily disk cache)."""
+        from infrastructure.data.futures_utils import get_nse_tokens
+        
         print("📊 Fetching Instrument Tokens...")
+        symbols = set()
+        for p in self.pairs_config:
+            symbols.add(p.get('stock_y') or p.get('leg1'))
+            symbols.add(p.get('stock_x') or p.get('leg2'))
+        
+        # Also add tokens for orphan pair symbols
+        for pair_key in self.orphan_pairs:
+            symbols.update(pair_key.split('-'))
+        
         tokens = {}
         try:
-            instruments = self.broker.instruments("NSE")
-            inst_map = {i['tradingsymbol']: i['instrument_token'] for i in instruments}
-            
-            for p in self.pairs_config:
-                s_y = p.get('stock_y') or p.get('leg1')
-                s_x = p.get('stock_x') or p.get('leg2')
-                if s_y in inst_map:
-                    tokens[s_y] = inst_map[s_y]
-                if s_x in inst_map:
-                    tokens[s_x] = inst_map[s_x]
-            
+            tokens = get_nse_tokens(self.broker, symbols)
             print(f"   ✅ Cached {len(tokens)} tokens")
         except Exception as e:
             print(f"   ⚠️ Failed to fetch instruments: {e}")
         
-        # Also add tokens for orphan pair symbols
-        for pair_key in self.orphan_pairs:
-            s1, s2 = pair_key.split('-')
-            if s1 in inst_map:
-                tokens[s1] = inst_map[s1]
-            if s2 in inst_map:
-                tokens[s2] = inst_map[s2]
-        
         return tokens
     
     def run(self):
@@ -246,6 +264,7 @@ class TradingEngine:
         
         # Start WebSocket if available (Optimization #6)
         if self.ticker:
+            self._publish_price_table()
             token_list = list(self.tokens.values())
             self.ticker.connect(token_list, on_price_update=self._on_realtime_tick)
         
@@ -265,7 +284,8 @@ class TradingEngine:
                 if COMPACT_MODE:
                     self._display_compact_table()
                 
-                time.sleep(PROCESS_INTERVAL_SEC)
+                # Wake on the next interval boundary, whatever the cycle took
+                time.sleep(seconds_to_next_interval(time.time(), PROCESS_INTERVAL_SEC))
                 
         except KeyboardInterrupt:
             self._shutdown()
@@ -361,35 +381,137 @@ class TradingEngine:
         expiry_str = self.pairs_config[0].get('expiry') if self.pairs_config else None
         price_data = self.data_cache.parallel_fetch_live(list(all_symbols), interval="day", expiry_str=expiry_str)
         
+        # Strategy signals first (concurrently when there is no GIL), then
+        # entries/exits pair by pair on this thread
+        signals = self._compute_signals(price_data) if FREE_THREADED else {}
+        
         # Process each config pair with fetched data
-        for p in self.pairs_config:
-            self._process_pair(p, price_data)
+        for plan in self._pair_plans:
+            self._process_pair(plan, price_data, signals)
         
         # Process orphan pairs (exit-only monitoring)
         # Use list() to copy dict items to avoid RuntimeError when dict changes during iteration
         for pair_key, orphan_data in list(self.orphan_pairs.items()):
             self._process_orphan_pair(pair_key, orphan_data, price_data)
     
-    def _process_pair(self, p: dict, price_data: Dict[str, pd.Series]):
-        """Process a single pair using pre-fetched data."""
+    @staticmethod
+    def _signal_ready(data_y: pd.Series, data_x: pd.Series) -> bool:
+        """True if both series have enough history and end on valid prices."""
+        if len(data_y) < 60 or len(data_x) < 60:
+            return False
+        last_y, last_x = data_y.values[-1], data_x.values[-1]
+        return not (last_y <= 0 or last_x <= 0 or math.isnan(last_y) or math.isnan(last_x))
+    
+    def _compute_signals(self, price_data: Dict[str, pd.Series]) -> Dict[str, dict]:
+        """
+        Run generate_signal for every ready config pair on a thread pool.
+        
+        Each pair owns its PairStrategy, so the calls share no state.
+        
+        Returns:
+            Dict of pair_key -> strategy response
+        """
+        jobs = {}
+        for plan in self._pair_plans:
+            data_y = price_data.get(plan['s1'])
+            data_x = price_data.get(plan['s2'])
+            if data_y is None or data_x is None or not self._signal_ready(data_y, data_x):
+                continue
+            jobs[plan['pair_key']] = (plan['strategy'], data_y, data_x)
+        
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
+            futures = {k: executor.submit(strategy.generate_signal, y, x)
+                       for k, (strategy, y, x) in jobs.items()}
+        return {k: f.result() for k, f in futures.items()}
+    
+    @staticmethod
+    def _sizing_plan(beta: float, lot_y: int, lot_x: int) -> Dict[str, Any]:
+        """
+        Beta-neutral lot sizing for a pair (pure function of its config).
+        
+        Returns:
+            Dict with base lots/shares, mismatch %, the best scaled (up to 5x)
+            lots and whether the mismatch rejects the pair
+        """
+        # 3. Beta-Neutral Position Sizing
+        if lot_x >= lot_y:
+            required_y = lot_x / beta
+            lots_y_calc = max(1, round(required_y / lot_y))
+            lots_x_calc = 1
+        else:
+            required_x = lot_y * beta
+            lots_x_calc = max(1, round(required_x / lot_x))
+            lots_y_calc = 1
+        
+        shares_y = lots_y_calc * lot_y
+        shares_x = lots_x_calc * lot_x
+        beta_required_x = shares_y * beta
+        
+        # Calculate mismatch
+        mismatch_shares = shares_x - beta_required_x
+        mismatch_pct = abs(mismatch_shares) / beta_required_x * 100 if beta_required_x > 0 else 0
+        
+        # 3a. Try to find better scaling combination (up to 5x)
+        best_lots_y, best_lots_x, best_mismatch = lots_y_calc, lots_x_calc, mismatch_pct
+        for scale in range(2, 6):
+            scaled_y = lots_y_calc * scale
+            scaled_x = lots_x_calc * scale
+            scaled_shares_y = scaled_y * lot_y
+            scaled_shares_x = scaled_x * lot_x
+            scaled_required = scaled_shares_y * beta
+            scaled_mismatch = abs(scaled_shares_x - scaled_required) / scaled_required * 100 if scaled_required > 0 else 0
+            if scaled_mismatch < best_mismatch:
+                best_lots_y, best_lots_x, best_mismatch = scaled_y, scaled_x, scaled_mismatch
+        
+        return {
+            'lots_y': lots_y_calc, 'lots_x': lots_x_calc,
+            'shares_y': shares_y, 'shares_x': shares_x,
+            'beta_required_x': beta_required_x, 'mismatch_pct': mismatch_pct,
+            'best_lots_y': best_lots_y, 'best_lots_x': best_lots_x, 'best_mismatch': best_mismatch,
+            # 3b. Mismatch > 20% rejects the pair unless scaling cuts it by 30%
+            'mismatch_reject': mismatch_pct > 20 and best_mismatch >= mismatch_pct * 0.7,
+        }
+    
+    def _build_pair_plan(self, p: dict) -> Dict[str, Any]:
+        """Everything _process_pair needs from a config entry, resolved once."""
         # Support both key formats
         s1 = p.get('stock_y') or p.get('leg1')
         s2 = p.get('stock_x') or p.get('leg2')
         pair_key = f"{s1}-{s2}"
-        strategy = self.strategies[pair_key]
+        beta = p.get('beta', 1.0)
+        lot_y = p.get('lot_size_y', 1)
+        lot_x = p.get('lot_size_x', 1)
+        return {
+            's1': s1, 's2': s2, 'pair_key': pair_key,
+            'strategy': self.strategies[pair_key],
+            'adf_pvalue': p.get('adf_pvalue', 0.05),
+            'intercept': p.get('intercept', 0),
+            'beta': beta, 'lot_y': lot_y, 'lot_x': lot_x,
+            'entry_beta': p.get('beta') or p.get('hedge_ratio', 1.0),
+            'sector': p.get('sector', 'UNKNOWN'),
+            'sizing': self._sizing_plan(beta, lot_y, lot_x),
+        }
+    
+    def _process_pair(self, plan: Dict[str, Any], price_data: Dict[str, pd.Series],
+                      signals: Optional[Dict[str, dict]] = None):
+        """Process a single pair (plan from _build_pair_plan) using pre-fetched data."""
+        s1, s2, pair_key = plan['s1'], plan['s2'], plan['pair_key']
+        strategy = plan['strategy']
         
         # Get data from cache
-        data_y = price_data.get(s1, pd.Series())
-        data_x = price_data.get(s2, pd.Series())
+        data_y = price_data.get(s1, _EMPTY_SERIES)
+        data_x = price_data.get(s2, _EMPTY_SERIES)
         
         if len(data_y) < 60 or len(data_x) < 60:
             return
         
         # Validate latest prices
-        last_y = data_y.iloc[-1]
-        last_x = data_x.iloc[-1]
+        last_y = data_y.values[-1]
+        last_x = data_x.values[-1]
         
-        if last_y <= 0 or last_x <= 0 or pd.isna(last_y) or pd.isna(last_x):
+        if last_y <= 0 or last_x <= 0 or math.isnan(last_y) or math.isnan(last_x):
             print(f"   🛡️ BLOCKED BAD DATA for {pair_key}")
             return
         
@@ -397,19 +519,17 @@ class TradingEngine:
         current_price_x = last_x
         
         # Get strategy signal
-        response = strategy.generate_signal(data_y, data_x)
+        response = signals.get(pair_key) if signals else None
+        if response is None:
+            response = strategy.generate_signal(data_y, data_x)
         
         health = response.get('health', 'UNKNOWN')
         z = response.get('zscore', 0.0)
         signal = response['signal']
         
-        # Get config statistics for enhanced output
-        adf_pvalue = p.get('adf_pvalue', 0.05)
-        std_err = p.get('std_err', 0)
-        intercept = p.get('intercept', 0)
-        beta = p.get('beta', 1.0)
-        lot_y = p.get('lot_size_y', 1)
-        lot_x = p.get('lot_size_x', 1)
+        # Config statistics for enhanced output
+        adf_pvalue = plan['adf_pvalue']
+        intercept = plan['intercept']
         
         # Intercept Ratio Check (for model validity)
         intercept_ratio = (abs(intercept) / current_price_y * 100) if current_price_y > 0 else 0
@@ -457,51 +577,25 @@ class TradingEngine:
             else:
                 print(f"   ✅ INTERCEPT: {intercept_ratio:.0f}% → EXCELLENT")
         
-        # 3. Beta-Neutral Position Sizing
-        if lot_x >= lot_y:
-            required_y = lot_x / beta
-            lots_y_calc = max(1, round(required_y / lot_y))
-            lots_x_calc = 1
-        else:
-            required_x = lot_y * beta
-            lots_x_calc = max(1, round(required_x / lot_x))
-            lots_y_calc = 1
-        
-        shares_y = lots_y_calc * lot_y
-        shares_x = lots_x_calc * lot_x
-        beta_required_x = shares_y * beta
-        
-        # Calculate mismatch
-        mismatch_shares = shares_x - beta_required_x
-        mismatch_pct = abs(mismatch_shares) / beta_required_x * 100 if beta_required_x > 0 else 0
-        
+        # 3. Beta-Neutral Position Sizing (precomputed per pair)
+        sizing = plan['sizing']
+        mismatch_pct = sizing['mismatch_pct']
         if VERBOSE:
-            print(f"   💼 SIZING: {lots_y_calc}L×{lot_y}={shares_y} Y | {lots_x_calc}L×{lot_x}={shares_x} X")
-            print(f"      ⚖️ Beta-Neutral: {shares_y}×{beta:.2f}={beta_required_x:.0f} vs {shares_x}")
-        
-        # 3a. Try to find better scaling combination (up to 5x)
-        best_lots_y, best_lots_x, best_mismatch = lots_y_calc, lots_x_calc, mismatch_pct
-        for scale in range(2, 6):
-            scaled_y = lots_y_calc * scale
-            scaled_x = lots_x_calc * scale
-            scaled_shares_y = scaled_y * lot_y
-            scaled_shares_x = scaled_x * lot_x
-            scaled_required = scaled_shares_y * beta
-            scaled_mismatch = abs(scaled_shares_x - scaled_required) / scaled_required * 100 if scaled_required > 0 else 0
-            if scaled_mismatch < best_mismatch:
-                best_lots_y, best_lots_x, best_mismatch = scaled_y, scaled_x, scaled_mismatch
+            beta, lot_y, lot_x = plan['beta'], plan['lot_y'], plan['lot_x']
+            print(f"   💼 SIZING: {sizing['lots_y']}L×{lot_y}={sizing['shares_y']} Y | {sizing['lots_x']}L×{lot_x}={sizing['shares_x']} X")
+            print(f"      ⚖️ Beta-Neutral: {sizing['shares_y']}×{beta:.2f}={sizing['beta_required_x']:.0f} vs {sizing['shares_x']}")
         
         # 3b. Mismatch Decision
-        if mismatch_pct > 20:
-            if best_mismatch < mismatch_pct * 0.7:
-                if VERBOSE: print(f"      ⚠️ MISMATCH: {mismatch_pct:.1f}% → TRY {best_lots_y}L×{best_lots_x}L = {best_mismatch:.1f}%")
+        if sizing['mismatch_reject']:
+            if VERBOSE: print(f"      🚫 MISMATCH: {mismatch_pct:.1f}% > 20% threshold")
+            model_valid = False
+        elif VERBOSE:
+            if mismatch_pct > 20:
+                print(f"      ⚠️ MISMATCH: {mismatch_pct:.1f}% → TRY {sizing['best_lots_y']}L×{sizing['best_lots_x']}L = {sizing['best_mismatch']:.1f}%")
+            elif mismatch_pct > 10:
+                print(f"      ⚠️ MISMATCH: {mismatch_pct:.1f}% → Consider spot adjustment")
             else:
-                if VERBOSE: print(f"      🚫 MISMATCH: {mismatch_pct:.1f}% > 20% threshold")
-                model_valid = False
-        elif mismatch_pct > 10:
-            if VERBOSE: print(f"      ⚠️ MISMATCH: {mismatch_pct:.1f}% → Consider spot adjustment")
-        else:
-            if VERBOSE: print(f"      ✅ MISMATCH: {mismatch_pct:.1f}% → ACCEPTABLE")
+                print(f"      ✅ MISMATCH: {mismatch_pct:.1f}% → ACCEPTABLE")
         
         # 4. Z-Score Signal (PDF-Compliant: Entry ±2.5, Exit ±1.0)
         if VERBOSE:
@@ -590,13 +684,12 @@ class TradingEngine:
             if signal not in ["LONG_SPREAD", "SHORT_SPREAD"]:
                 return
             
-            beta = p.get('beta') or p.get('hedge_ratio', 1.0)
             self._handle_entry(
                 pair_key, signal, s1, s2, 
                 current_price_y, current_price_x, 
-                beta, p.get('intercept', 0),
+                plan['entry_beta'], intercept,
                 entry_zscore=z,  # Phase 6.3: Record entry Z-Score
-                sector=p.get('sector', 'UNKNOWN')  # Phase 9: Sector diversification
+                sector=plan['sector']  # Phase 9: Sector diversification
             )
     
 
@@ -615,18 +708,18 @@ class TradingEngine:
         strategy = self.strategies[pair_key]
         
         # Get data from cache
-        data_y = price_data.get(s1, pd.Series())
-        data_x = price_data.get(s2, pd.Series())
+        data_y = price_data.get(s1, _EMPTY_SERIES)
+        data_x = price_data.get(s2, _EMPTY_SERIES)
         
         if len(data_y) < 60 or len(data_x) < 60:
             print(f"   👻 {pair_key:<20} | Insufficient data for orphan monitoring")
             return
         
         # Validate latest prices
-        last_y = data_y.iloc[-1]
-        last_x = data_x.iloc[-1]
+        last_y = data_y.values[-1]
+        last_x = data_x.values[-1]
         
-        if last_y <= 0 or last_x <= 0 or pd.isna(last_y) or pd.isna(last_x):
+        if last_y <= 0 or last_x <= 0 or math.isnan(last_y) or math.isnan(last_x):
             return
         
         current_price_y = last_y
@@ -864,11 +957,22 @@ class TradingEngine:
         
         return market_open <= now <= market_close
     
+    def _publish_price_table(self):
+        """Create the shared price table the dashboard attaches to."""
+        from trading_floor.shared_state import SharedPriceTable
+        try:
+            self.price_table = SharedPriceTable(sorted(self.tokens))
+        except Exception as e:
+            print(f"   ⚠️ Shared price table unavailable: {e}")
+            return
+        self._token_slots = {token: self.price_table.slot(sym) for sym, token in self.tokens.items()}
+    
     def _on_realtime_tick(self, token: int, price: float, timestamp):
         """Callback for WebSocket price updates (Optimization #6)."""
-        # Could trigger immediate re-evaluation for specific pairs
-        # For now, just log
-        pass
+        # Publish to the shared price table; pairs are re-evaluated each cycle
+        slot = self._token_slots.get(token)
+        if slot is not None and price and price > 0:
+            self.price_table.set_price(slot, price)
     
     def _shutdown(self):
         """Graceful shutdown."""
@@ -881,6 +985,8 @@ class TradingEngine:
         # Stop WebSocket
         if self.ticker:
             self.ticker.stop()
+        if self.price_table is not None:
+            self.price_table.close()
         
         print("   ✅ Shutdown complete.")
 
@@ -9,6 +9,8 @@ from typing import Tuple, Dict, Optional
 import sys
 import os
 
+import numpy as np
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 
@@ -59,6 +61,28 @@ class LiquidityChecker:
         
         return spread_abs, spread_pct
     
+    def calculate_spread_batch(self, bids: np.ndarray, asks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized calculate_spread for many quotes at once.
+        
+        Args:
+            bids: Best bid prices
+            asks: Best ask prices
+            
+        Returns:
+            Tuple of (spread_absolute, spread_percentage) arrays.
+            Rows with a non-positive bid or ask get 0.0 (same as scalar).
+        """
+        bids = np.asarray(bids, dtype=np.float64)
+        asks = np.asarray(asks, dtype=np.float64)
+        
+        valid = (bids > 0) & (asks > 0)
+        spread_abs = np.where(valid, asks - bids, 0.0)
+        mid = np.where(valid, (bids + asks) / 2, 1.0)
+        spread_pct = np.where(valid, spread_abs / mid, 0.0)
+        
+        return spread_abs, spread_pct
+    
     def check_spread(self, symbol: str, bid: float, ask: float) -> Tuple[bool, str]:
         """
         Check if bid-ask spread is acceptable.
@@ -166,6 +190,45 @@ class LiquidityChecker:
         details['passed'] = True
         return True, f"Liquidity OK: Y={spread_y*100:.2f}% X={spread_x*100:.2f}%", details
     
+    def validate_entries_batch(self,
+                               bid_y: np.ndarray, ask_y: np.ndarray, qty_y: np.ndarray,
+                               bid_x: np.ndarray, ask_x: np.ndarray, qty_x: np.ndarray,
+                               depth_y: Tuple[np.ndarray, np.ndarray] = None,
+                               depth_x: Tuple[np.ndarray, np.ndarray] = None) -> np.ndarray:
+        """
+        Vectorized validate_entry for many candidate pairs.
+        
+        Applies the same gates as validate_entry (per-leg spread, total
+        spread, optional depth) as array comparisons instead of one Python
+        call per pair.
+        
+        Args:
+            bid_y, ask_y, bid_x, ask_x: Quote arrays (one row per pair)
+            qty_y, qty_x: Required quantity arrays
+            depth_y: Tuple of (bid_qty, ask_qty) arrays for Y (optional)
+            depth_x: Tuple of (bid_qty, ask_qty) arrays for X (optional)
+            
+        Returns:
+            Boolean mask - True where validate_entry would pass
+        """
+        _, spread_y = self.calculate_spread_batch(bid_y, ask_y)
+        _, spread_x = self.calculate_spread_batch(bid_x, ask_x)
+        
+        # Negated '>' keeps the scalar semantics (fail only when strictly wider)
+        mask = ~(spread_y > self.MAX_SPREAD_PCT)
+        mask &= ~(spread_x > self.MAX_SPREAD_PCT)
+        mask &= ~((spread_y + spread_x) > self.MAX_TOTAL_SPREAD)
+        
+        if depth_y is not None:
+            total_y = np.asarray(depth_y[0]) + np.asarray(depth_y[1])
+            mask &= ~(total_y < np.asarray(qty_y) * self.MIN_DEPTH_MULTIPLIER)
+        
+        if depth_x is not None:
+            total_x = np.asarray(depth_x[0]) + np.asarray(depth_x[1])
+            mask &= ~(total_x < np.asarray(qty_x) * self.MIN_DEPTH_MULTIPLIER)
+        
+        return mask
+    
     def estimate_impact_cost(self, price: float, qty: int, side: str,
                              bid: float = None, ask: float = None) -> float:
         """
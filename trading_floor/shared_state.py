@@ -0,0 +1,120 @@
+"""
+Shared Price Table - engine -> dashboard price feed
+
+The engine writes WebSocket ticks into a named shared-memory block (one
+float64 slot per symbol plus a last-write timestamp). The dashboard
+attaches by name and reads the prices zero-copy, instead of making its own
+REST LTP calls while the engine is running.
+
+A small JSON sidecar in the cache dir records the block name and symbol
+order. Aligned 8-byte stores are atomic on the platforms we run on, so
+readers take no lock; a slot can be one tick behind, never torn.
+"""
+
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+import infrastructure.config as config
+
+SIDECAR_FILE = os.path.join(config.CACHE_DIR, "shared_prices.json")
+
+# Readers ignore a table that hasn't been written for this long (engine gone)
+STALE_AFTER_SEC = 120
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """Open an existing block without letting this process unlink it at exit."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class SharedPriceTable:
+    """
+    Last traded prices in shared memory, one slot per symbol.
+    
+    Slots hold 0.0 until the symbol has ticked. The extra last slot holds
+    the time of the most recent write.
+    """
+    
+    def __init__(self, symbols: Iterable[str], shm: Optional[shared_memory.SharedMemory] = None,
+                 sidecar_file: Optional[str] = None):
+        """
+        Args:
+            symbols: Symbols in slot order
+            shm: Existing block to wrap (see attach); a new one is created if None
+            sidecar_file: Optional override for the sidecar path
+        """
+        self.symbols = tuple(symbols)
+        self.sidecar_file = sidecar_file or SIDECAR_FILE
+        self._owner = shm is None
+        n = len(self.symbols) + 1
+        self._shm = shm or shared_memory.SharedMemory(create=True, size=n * 8)
+        self._arr = np.ndarray((n,), dtype=np.float64, buffer=self._shm.buf)
+        self._slots: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        
+        if self._owner:
+            self._arr[:] = 0.0
+            from trading_floor.state import dumps_json, write_atomic
+            write_atomic(self.sidecar_file, dumps_json({
+                "name": self._shm.name,
+                "symbols": list(self.symbols),
+            }))
+    
+    @classmethod
+    def attach(cls, sidecar_file: Optional[str] = None) -> Optional['SharedPriceTable']:
+        """
+        Attach to the table published by another process.
+        
+        Returns:
+            SharedPriceTable, or None if no table is published
+        """
+        sidecar_file = sidecar_file or SIDECAR_FILE
+        try:
+            from trading_floor.state import loads_json
+            with open(sidecar_file, 'rb') as f:
+                meta = loads_json(f.read())
+            shm = _attach_block(meta["name"])
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(meta["symbols"], shm=shm, sidecar_file=sidecar_file)
+    
+    def slot(self, symbol: str) -> Optional[int]:
+        """Slot index for a symbol (None if not in the table)."""
+        return self._slots.get(symbol)
+    
+    def set_price(self, slot: int, price: float):
+        """Writer side: store a price and stamp the write time."""
+        self._arr[slot] = price
+        self._arr[-1] = time.time()
+    
+    def is_stale(self) -> bool:
+        """True if nothing has been written for STALE_AFTER_SEC."""
+        return time.time() - self._arr[-1] > STALE_AFTER_SEC
+    
+    def prices(self) -> Dict[str, float]:
+        """Reader side: symbol -> price for every symbol that has ticked."""
+        values = self._arr[:-1].copy()
+        return {s: float(v) for s, v in zip(self.symbols, values) if v > 0}
+    
+    def close(self):
+        """Detach; the creating process also removes the block and sidecar."""
+        self._arr = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            try:
+                os.remove(self.sidecar_file)
+            except OSError:
+                pass
@@ -7,21 +7,59 @@ Prevents losing track of open positions on crashes/restarts.
 
 import os
 import json
+import time
 import threading
 from datetime import datetime
 from typing import Dict, Any, Optional
 
 import infrastructure.config as config
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to stdlib json
+    orjson = None
+
+
+def dumps_json(state: Dict[str, Any]) -> bytes:
+    """Serialize state to compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(
+            state,
+            default=str,
+            option=(orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY |
+                    orjson.OPT_PASSTHROUGH_DATETIME)
+        )
+    return json.dumps(state, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def write_atomic(path: str, data: bytes):
+    """Write bytes to `path` via a temp file and rename, so readers never see a torn file."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_file = path + ".tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(data)
+    os.replace(temp_file, path)
+
+
+def loads_json(data: bytes) -> Dict[str, Any]:
+    """Parse JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class StateManager:
     """
     Thread-safe state persistence manager.
     
     Saves and loads trading state (active_trades, etc.) to JSON.
-    Auto-saves on every state change for crash recovery.
+    Auto-saves on every state change for crash recovery; saves that
+    leave active_trades unchanged skip the disk write, unless the file is
+    missing or was last written REFRESH_SEC ago (keeps last_updated fresh).
     """
     
+    REFRESH_SEC = 60.0
+    
     def __init__(self, state_file: Optional[str] = None):
         """
         Args:
@@ -34,6 +72,8 @@ class StateManager:
             "last_updated": None,
             "version": "1.0"
         }
+        self._last_trades: Optional[bytes] = None  # Serialized active_trades last written
+        self._last_write = float('-inf')  # time.monotonic() of that write
     
     def load(self) -> Dict[str, Any]:
         """
@@ -48,10 +88,11 @@ class StateManager:
                 return {}
             
             try:
-                with open(self.state_file, 'r') as f:
-                    self._state = json.load(f)
+                with open(self.state_file, 'rb') as f:
+                    self._state = loads_json(f.read())
                 
                 active_trades = self._state.get("active_trades", {})
+                self._last_trades = dumps_json(active_trades)
                 last_updated = self._state.get("last_updated", "unknown")
                 print(f"   📂 Loaded state: {len(active_trades)} active trades (last: {last_updated})")
                 return active_trades
@@ -65,28 +106,31 @@ class StateManager:
     
     def save(self, active_trades: Dict[str, Any]) -> bool:
         """
-        Save state to disk.
+        Save state to disk (skipped when active_trades is unchanged and the
+        file was written less than REFRESH_SEC ago).
         
         Args:
             active_trades: Dict of active trades to persist
             
         Returns:
-            True if saved successfully
+            True if saved successfully (or already up to date)
         """
         with self._lock:
-            self._state["active_trades"] = active_trades
-            self._state["last_updated"] = datetime.now().isoformat()
-            
             try:
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+                trades = dumps_json(active_trades)
+                now = time.monotonic()
+                if (trades == self._last_trades
+                        and now - self._last_write < self.REFRESH_SEC
+                        and os.path.exists(self.state_file)):
+                    return True
                 
-                # Write atomically (write to temp, then rename)
-                temp_file = self.state_file + ".tmp"
-                with open(temp_file, 'w') as f:
-                    json.dump(self._state, f, indent=2, default=str)
+                self._state["active_trades"] = active_trades
+                self._state["last_updated"] = datetime.now().isoformat()
                 
-                os.replace(temp_file, self.state_file)
+                # Write atomically (write to temp, then rename)
+                write_atomic(self.state_file, dumps_json(self._state))
+                self._last_trades = trades
+                self._last_write = now
                 return True
                 
             except Exception as e:
@@ -127,6 +171,7 @@ class StateManager:
                 "last_updated": None,
                 "version": "1.0"
             }
+            self._last_trades = None
             if os.path.exists(self.state_file):
                 try:
                     os.remove(self.state_file)